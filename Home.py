@@ -1,20 +1,20 @@
 # Bibliotecas 
 #============================================
-import pandas as pd
+import json
+import locale
 import numpy as np
-import inflection
 import streamlit as st
-import plotly.express as px
-import matplotlib.pyplot as plt
-import plotly.graph_objects as go
-import folium 
-import locale
+import streamlit.components.v1 as components
 
-from folium.plugins import MarkerCluster
-from streamlit_folium import folium_static
 from PIL import Image
-from datetime import time
-from datetime import datetime
+from fomezero import (DEFAULT_COUNTRIES, GRID_MAX_ZOOM, GRID_MIN_ZOOM, LRUCache, cell_size, file_signature,
+                      grid_cells, lazy_import, load_country_partials, load_dataset, load_geo_grid, load_map_points,
+                      merge_countries)
+
+# Só usados quando o HTML do mapa não está no cache
+folium = lazy_import('folium')
+folium_plugins = lazy_import('folium.plugins')
+jinja2 = lazy_import('jinja2')
  
 
 st.set_page_config(page_title="Main", page_icon="🏠", layout="wide", initial_sidebar_state='auto')
@@ -22,209 +22,161 @@ st.set_page_config(page_title="Main", page_icon="🏠", layout="wide", initial_s
 # Funções
 #============================================
 
-# 1. Preenchimento do nome dos países
-#============================================
+# 1. Plotando mapa
+#===========================================================================================
+
+# Cria cada pino no navegador com a mesma aparência do folium.Icon(icon='home')
+MARKER_CALLBACK = """function (row) {
+    var icon = L.AwesomeMarkers.icon({
+        icon: 'home', markerColor: row[2], iconColor: 'white', prefix: 'glyphicon'
+    });
+    var marker = L.marker(new L.LatLng(row[0], row[1]), {icon: icon});
+    marker.bindPopup(row[3], {maxWidth: '100%'});
+    marker.bindTooltip('clique aqui');
+    return marker;
+}"""
+
+
+def build_map (points):
+    # points: linhas da tabela de pontos (geo.map_points) dos países selecionados
+
+    # Uma linha por restaurante: [latitude, longitude, cor, popup], com cor e
+    # popup já montados em geo.map_points
+    data = list(zip(points['latitude'].tolist(), points['longitude'].tolist(),
+                    points['marker_color'].tolist(), points['popup'].tolist()))
+
+    # Criando o mapa: os pinos são criados no navegador a partir de um único
+    # array JSON, em vez de um folium.Marker por restaurante.
+    map1 = folium.Map()
+    folium_plugins.FastMarkerCluster(data, callback=MARKER_CALLBACK).add_to(map1)
+
+    return map1
+
+
+def map_html (points):
+    # Mesmo HTML que o folium_static geraria para o mapa
+    return folium.Figure().add_child(build_map(points)).render()
+
+
+# 2. Cache do HTML do mapa por seleção de países
+#===========================================================================================
+
+MAP_CACHE_ENTRIES = 16
+MAP_CACHE_BYTES = 256 * 1024 * 1024
+
+@st.cache_resource(max_entries=1, show_spinner=False)
+def map_cache(signature, _points):
+    # Um cache por versão do dataset, já aquecido com o filtro padrão
+    cache = LRUCache(max_entries=MAP_CACHE_ENTRIES, max_bytes=MAP_CACHE_BYTES)
+    html = map_html(_points.loc[_points['country'].isin(DEFAULT_COUNTRIES), :])
+    cache.put(frozenset(DEFAULT_COUNTRIES), html, len(html.encode()))
+    return cache
+
+
+def show_map (points, key, build):
+    cache = map_cache(file_signature(), points)
+
+    html = cache.get(key)
+    if html is None:
+        html = build()
+        cache.put(key, html, len(html.encode()))
+
+    # Exibindo o mapa
+    components.html(html, width=1024, height=460)
 
-COUNTRIES = {
-    1: "India",
-    14: "Australia",
-    30: "Brazil",
-    37: "Canada",
-    94: "Indonesia",
-    148: "New Zeland",
-    162: "Philippines",
-    166: "Qatar",
-    184: "Singapure",
-    189: "South Africa",
-    191: "Sri Lanka",
-    208: "Turkey",
-    214: "United Arab Emirates",
-    215: "England",
-    216: "United States of America",
-}
-
-#===============================================
-def country_name(country_id):
-    return COUNTRIES[country_id]
-
-
-
-# 2. Criação do Tipo de Categoria de Comida
-#===============================================
-
-def create_price_tye(price_range):
-    if price_range == 1:
-        return "cheap"
-    elif price_range == 2:
-        return "normal"
-    elif price_range == 3:
-        return "expensive"
-    else:
-        return "gourmet"
-
-
-# 3. Criação do nome das Cores 
-#================================================
-
-COLORS = {
-    "3F7E00": "darkgreen",
-    "5BA829": "green",
-    "9ACD32": "lightgreen",
-    "CDD614": "orange",
-    "FFBA00": "red",
-    "CBCBC8": "darkred",
-    "FF7800": "darkred",
-}
-def color_name(color_code):
-    return COLORS[color_code]
-
-#================================================
-
-def adjust_columns_order(dataframe):
-    df = dataframe.copy()
-
-    new_cols_order = [
-        "restaurant_id",
-        "restaurant_name",
-        "country",
-        "city",
-        "address",
-        "locality",
-        "locality_verbose",
-        "longitude",
-        "latitude",
-        "cuisines",
-        "price_type",
-        "average_cost_for_two",
-        "currency",
-        "has_table_booking",
-        "has_online_delivery",
-        "is_delivering_now",
-        "aggregate_rating",
-        "rating_color",
-        "color_name",
-        "rating_text",
-        "votes",
-    ]
-
-    return df.loc[:, new_cols_order]
-
-
-#  4. Renomeando as colunas do Dataframe
-#============================================
 
-def rename_columns(dataframe):
-    df = dataframe.copy()
-    title = lambda x: inflection.titleize(x)
-    snakecase = lambda x: inflection.underscore(x)
-    spaces = lambda x: x.replace(" ", "")
-    cols_old = list(df.columns)
-    cols_old = list(map(title, cols_old))
-    cols_old = list(map(spaces, cols_old))
-    cols_new = list(map(snakecase, cols_old))
-    df.columns = cols_new
-    return df
-
-
-#  5. Limpeza dos dados
-#==============================================
-
-def clean_code(df1):
-    """ Esta função tem a responsabilidade de limpar o dataframe
-
-        Tipos de limpeza:
-        1. Removendo os valores NaN
-        2. Renomeando as colunas
-        3. Criação de colunas
-        4. Categorizando tipo de restaurantes por 1 tipo de culinária
-        5. Removendo Linhas Duplicadas
-        6. Ajustando as colunas em ordem 
-        7. Eliminando a possibilidade de ter espaços nas colunas Texto/ object(trim)    
-
-        Input: Dataframe
-        Output: Dataframe 
-    """
-
-    # 1. Removendo os valores NaN
-    df1 = df1.dropna()
-
-    # 2. Renomeando as colunas
-    df1 = rename_columns(df1)
-
-    # 3. Criação de colunas
-    df1['price_type'] = df1.loc[:, 'price_range'].apply(lambda x: create_price_tye(x))
-    df1["country"] = df1.loc[:, "country_code"].apply(lambda x: country_name(x))
-    df1["color_name"] = df1.loc[:, "rating_color"].apply(lambda x: color_name(x))
-
-    # 4. Categorizando tipo de restaurantes por 1 tipo de culinária
-    df1['cuisines'] = df1['cuisines'].astype(str)
-    df1['cuisines'] = df1.loc[:, "cuisines"].apply(lambda x: x.split(",")[0])
-
-    # 5. Removendo Linhas Duplicadas
-    df1 = df1.drop_duplicates()
-
-    # 6. Ajustando as colunas em ordem 
-    df1 = adjust_columns_order(df1)
-
-    # 7. Eliminando a possibilidade de ter espaços nas colunas Texto/ object(trim)
-    # df1.dtypes
-
-    df1.loc[:, 'restaurant_name'] = df1.loc[:, 'restaurant_name'].str.strip()
-    df1.loc[:, 'city'] = df1.loc[:, 'city'].str.strip()
-    df1.loc[:, 'address'] = df1.loc[:, 'address'].str.strip()
-    df1.loc[:, 'locality'] = df1.loc[:, 'locality'].str.strip()
-    df1.loc[:, 'locality_verbose'] = df1.loc[:, 'locality_verbose'].str.strip()
-    df1.loc[:, 'cuisines'] = df1.loc[:, 'cuisines'].str.strip()
-    df1.loc[:, 'currency'] = df1.loc[:, 'currency'].str.strip()
-    df1.loc[:, 'rating_color'] = df1.loc[:, 'rating_color'].str.strip()
-    df1.loc[:, 'rating_text'] = df1.loc[:, 'rating_text'].str.strip()
-    df1.loc[:, 'country'] = df1.loc[:, 'country'].str.strip()
-    df1.loc[:, 'color_name'] = df1.loc[:, 'color_name'].str.strip()
-
-    return df1
-
-# 6. Plotando mapa
+def group_map (points, countries):
+    show_map(points, frozenset(countries),
+             lambda: map_html(points.loc[points['country'].isin(countries), :]))
+
+
+# 3. Mapa de densidade (grade pré-calculada)
 #===========================================================================================
 
-def group_map (df1):
-    # Armazenando os dados na variável df_aux.
-    df_aux = (df1.loc[:, ['city', 'aggregate_rating', 'currency', 'cuisines', 'color_name', 'restaurant_id','latitude', 'longitude', 'average_cost_for_two', 'restaurant_name']]
-                    .groupby(['city', 'cuisines','color_name', 'currency', 'restaurant_id', 'restaurant_name'])
-                    .median().reset_index())
+# Amarelo -> vermelho (YlOrRd), da célula com menos para a com mais restaurantes
+DENSITY_COLORS = ['#ffffcc', '#ffeda0', '#fed976', '#feb24c', '#fd8d3c', '#fc4e2a', '#e31a1c', '#bd0026', '#800026']
+
+# Desenha no navegador só a grade do zoom atual; trocar o zoom troca a grade
+DENSITY_SCRIPT = """{% macro script(this, kwargs) %}
+(function (map, levels, minZoom, maxZoom, colors) {
+    var layer = L.layerGroup().addTo(map);
+    var renderer = L.canvas();
+    var shown = null;
+    function draw() {
+        var zoom = Math.min(Math.max(map.getZoom(), minZoom), maxZoom);
+        if (zoom === shown) { return; }
+        shown = zoom;
+        layer.clearLayers();
+        var size = levels[zoom].size;
+        levels[zoom].cells.forEach(function (c) {
+            var south = c[0] * size - 90, west = c[1] * size - 180;
+            L.rectangle([[south, west], [south + size, west + size]],
+                        {renderer: renderer, stroke: false, fillColor: colors[c[5]], fillOpacity: 0.7})
+             .bindTooltip(c[2] + ' restaurantes<br>Nota média: ' + c[3] + '/5.0<br>Preço médio para dois: ' + c[4])
+             .addTo(layer);
+        });
+    }
+    map.on('zoomend', draw);
+    draw();
+})({{ this._parent.get_name() }}, {{ this.levels }}, {{ this.min_zoom }}, {{ this.max_zoom }}, {{ this.colors }});
+{% endmacro %}"""
+
+
+def density_cost (cells):
+    # Preço médio com a moeda; células com mais de uma moeda não têm média
+    return [f'{cost:.2f} {currency}' if isinstance(currency, str) else 'várias moedas'
+            for cost, currency in zip(cells['cost_mean'].tolist(), cells['currency'].tolist())]
+
+
+def build_density_map (grid, countries):
+    # Uma lista de células ocupadas por zoom: [linha, coluna, restaurantes, nota, preço, cor]
+    levels = {}
+    for zoom in range(GRID_MIN_ZOOM, GRID_MAX_ZOOM + 1):
+        cells = grid_cells(grid, zoom, countries)
+        scale = np.log1p(cells['restaurants'].to_numpy())
+        color = np.rint(scale / max(scale.max(initial=0), 1) * (len(DENSITY_COLORS) - 1)).astype(int)
+        levels[zoom] = {'size': cell_size(zoom), 'cells': list(zip(
+            cells['row'].tolist(), cells['col'].tolist(), cells['restaurants'].tolist(),
+            cells['rating_mean'].round(1).tolist(), density_cost(cells), color.tolist()))}
 
-    # Criando o mapa.
     map1 = folium.Map()
-    marker_cluster = folium.plugins.MarkerCluster().add_to(map1)
-
-    # Inserindo os pinos com informações e cores distintas                   
-    for i in range ( len (df_aux) ):
-            popup_html = f'<div style="width: 250px;">' \
-                        f"<b>{df_aux.loc[i, 'restaurant_name']}</b><br><br>" \
-                        \
-                        f"Preço para dois: {df_aux.loc[i, 'average_cost_for_two']:.2f} ( {df_aux.loc[i, 'currency']})<br> " \
-                        f"Type: {df_aux.loc[i, 'cuisines']}<br>" \
-                        f"Nota: {df_aux.loc[i, 'aggregate_rating']}/5.0" \
-                        f'</div>'
-            folium.Marker ([df_aux.loc[i, 'latitude'], df_aux.loc[i, 'longitude']],
-                        popup=popup_html, width=500, height=500, tooltip='clique aqui', parse_html=True,  
-                        zoom_start=30, tiles= 'Stamen Toner', 
-                        icon=folium.Icon(color=df_aux.loc[i, 'color_name'] , icon='home')).add_to(marker_cluster)
-    # Exibindo o mapa    
-    folium_static( map1, width=1024 , height=450)   
+    if len(cells):
+        # cells: grade mais fina, a que melhor delimita os restaurantes
+        map1.fit_bounds([[cells['south'].min(), cells['west'].min()],
+                         [cells['south'].max() + cells['size'].iloc[0], cells['west'].max() + cells['size'].iloc[0]]])
+
+    layer = folium.MacroElement()
+    layer._template = jinja2.Template(DENSITY_SCRIPT)
+    layer.levels = json.dumps(levels)
+    layer.min_zoom, layer.max_zoom = GRID_MIN_ZOOM, GRID_MAX_ZOOM
+    layer.colors = json.dumps(DENSITY_COLORS)
+    map1.add_child(layer)
 
     return map1
 
 
+def density_map (points, grid, countries):
+    show_map(points, ('densidade', frozenset(countries)),
+             lambda: folium.Figure().add_child(build_density_map(grid, countries)).render())
+
+
 #----------------------------------------------------- Inicio da Estrutura Lógica do Código ---------------------------------------------
 
-# DataFrame importado
+# DataFrame importado e limpo (cache compartilhado entre sessões)
+#============================================
+df1 = load_dataset()
+
+# Estados parciais por país (as métricas do topo apenas os combinam)
+#============================================
+country_partials = load_country_partials()
+
+# Pontos do mapa (uma linha por restaurante, sem agrupamento na renderização)
 #============================================
-dataFrame = pd.read_csv( 'Datasets/zomato.csv' )
+map_points = load_map_points()
 
-# Limpando os dados
+# Grade de densidade (células por zoom, calculadas uma vez)
 #============================================
-df1 = clean_code(dataFrame)
-df2 = df1.copy()
+geo_grid = load_geo_grid()
 
 
 #====================================================================================================
@@ -243,12 +195,11 @@ st.sidebar.markdown( '# Filtros' )
 countries = st.sidebar.multiselect(
         "Escolha os Paises que Deseja visualizar as Informações",
         df1.loc[:, "country"].unique().tolist(),
-        default=["Brazil", "England", "Qatar", "South Africa", "Canada", "Australia", "Philippines", "United States of America", "Singapure", "United Arab Emirates", "India", "Indonesia", "New Zeland", "Sri Lanka", "Turkey"],
+        default=DEFAULT_COUNTRIES,
 )
 
 #-----Habilitando o filtro de Países -----
-linhas_selecionadas = df1['country'].isin( countries )
-df1 = df1.loc[linhas_selecionadas, :]
+metricas = merge_countries(country_partials, countries)
 
 
 # Final da barra lateral
@@ -277,36 +228,41 @@ col1, col2, col3, col4, col5 = st.columns (5, gap='small')
 with st.container():
     with col1:
         #Quantidade de restaurantes cadastrados
-        df_aux = df1.loc[:, 'restaurant_id'].nunique()
+        df_aux = metricas['restaurant_id']
         col1.metric ( label='Restaurantes Cadastrados', value=df_aux, help='Quantidade Restaurantes conforme filtro')
 
     with col2:
         #Quantidade de países 
-        df_aux = df1.loc[:, 'country'].nunique()
+        df_aux = metricas['countries']
         col2.metric ( label='Países Selecionados', value=df_aux, help='Quantidade de Países conforme filtro')
     
     with col3:
         #Quantidade de cidades
-        df_aux = df1.loc[:,'city'].nunique()
+        df_aux = metricas['city']
         col3.metric ( label='Cidades Cadastradas', value=df_aux, help='Quantidade de Cidades conforme filtro')
 
     with col4:
         #Quantidade de Avaliações feitas na plataforma
-        df_aux = df1.loc[:,'votes'].sum()
+        df_aux = metricas['votes']
         locale.setlocale(locale.LC_ALL, '')
         df_aux = locale.format_string('%d', df_aux, grouping=True)
         col4.metric ( label='Avaliações na Plataforma', value=df_aux, help='Qtde Avaliações conforme filtro')
 
     with col5:
         #Quantidade de tipos de culinárias feitas na plataforma
-        df_aux = df1.loc[:,'cuisines'].nunique()
+        df_aux = metricas['cuisines']
         col5.metric ( label='Tipos de Culinárias Oferecidas', value=df_aux, help='Qtde Avaliações conforme filtro')
 
 
 st.container()
 
 st.write ('### 🌎 Mapa com a Localização dos restaurantes')
-group_map(df1)
+camada = st.radio('Camada do mapa', ['Restaurantes', 'Densidade'], horizontal=True,
+                  help='Densidade: restaurantes por região, com nota e preço médios (a grade acompanha o zoom)')
+if camada == 'Restaurantes':
+    group_map(map_points, countries)
+else:
+    density_map(map_points, geo_grid, countries)
 
 st.markdown("""___""")
 
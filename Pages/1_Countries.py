@@ -1,20 +1,12 @@
 # Bibliotecas necessárias
 #============================================
-import pandas as pd
-import numpy as np
-import inflection
 import streamlit as st
-import plotly.express as px
-import matplotlib.pyplot as plt
-import plotly.graph_objects as go
-import folium 
-from folium.plugins import MarkerCluster
-from streamlit_folium import folium_static
-import locale
+
 from PIL import Image
-import time
-from datetime import datetime
-from haversine import haversine
+from fomezero import DEFAULT_COUNTRIES, lazy_import, load_country_summary, select_countries, show_figure
+
+# Só usado quando a figura não está no cache
+px = lazy_import('plotly.express')
 
 
 st.set_page_config(page_title="Countries", page_icon="🌍", layout="wide", initial_sidebar_state='auto')
@@ -22,172 +14,11 @@ st.set_page_config(page_title="Countries", page_icon="🌍", layout="wide", init
 # Funções
 #============================================
 
-# 1. Preenchimento do nome dos países
-#============================================
-
-COUNTRIES = {
-    1: "India",
-    14: "Australia",
-    30: "Brazil",
-    37: "Canada",
-    94: "Indonesia",
-    148: "New Zeland",
-    162: "Philippines",
-    166: "Qatar",
-    184: "Singapure",
-    189: "South Africa",
-    191: "Sri Lanka",
-    208: "Turkey",
-    214: "United Arab Emirates",
-    215: "England",
-    216: "United States of America",
-}
-
-#===============================================
-def country_name(country_id):
-    return COUNTRIES[country_id]
-
-
-
-# 2. Criação do Tipo de Categoria de Comida
-#===============================================
-
-def create_price_tye(price_range):
-    if price_range == 1:
-        return "cheap"
-    elif price_range == 2:
-        return "normal"
-    elif price_range == 3:
-        return "expensive"
-    else:
-        return "gourmet"
-
-
-# 3. Criação do nome das Cores 
-#================================================
-
-COLORS = {
-    "3F7E00": "darkgreen",
-    "5BA829": "green",
-    "9ACD32": "lightgreen",
-    "CDD614": "orange",
-    "FFBA00": "red",
-    "CBCBC8": "darkred",
-    "FF7800": "darkred",
-}
-def color_name(color_code):
-    return COLORS[color_code]
-
-#================================================
-
-def adjust_columns_order(dataframe):
-    df = dataframe.copy()
-
-    new_cols_order = [
-        "restaurant_id",
-        "restaurant_name",
-        "country",
-        "city",
-        "address",
-        "locality",
-        "locality_verbose",
-        "longitude",
-        "latitude",
-        "cuisines",
-        "price_type",
-        "average_cost_for_two",
-        "currency",
-        "has_table_booking",
-        "has_online_delivery",
-        "is_delivering_now",
-        "aggregate_rating",
-        "rating_color",
-        "color_name",
-        "rating_text",
-        "votes",
-    ]
-
-    return df.loc[:, new_cols_order]
-
-
-#  4. Renomeando as colunas do Dataframe
-#============================================
-
-def rename_columns(dataframe):
-    df = dataframe.copy()
-    title = lambda x: inflection.titleize(x)
-    snakecase = lambda x: inflection.underscore(x)
-    spaces = lambda x: x.replace(" ", "")
-    cols_old = list(df.columns)
-    cols_old = list(map(title, cols_old))
-    cols_old = list(map(spaces, cols_old))
-    cols_new = list(map(snakecase, cols_old))
-    df.columns = cols_new
-    return df
-
-
-#  5. Limpeza dos dados
-#==============================================
-
-def clean_code(df1):
-    """ Esta função tem a responsabilidade de limpar o dataframe
-
-        Tipos de limpeza:
-        1. Removendo os valores NaN
-        2. Renomeando as colunas
-        3. Criação de colunas
-        4. Categorizando tipo de restaurantes por 1 tipo de culinária
-        5. Removendo Linhas Duplicadas
-        6. Ajustando as colunas em ordem 
-        7. Eliminando a possibilidade de ter espaços nas colunas Texto/ object(trim)    
-
-        Input: Dataframe
-        Output: Dataframe 
-    """
-
-    # 1. Removendo os valores NaN
-    df1 = df1.dropna()
-
-    # 2. Renomeando as colunas
-    df1 = rename_columns(df1)
-
-    # 3. Criação de colunas
-    df1['price_type'] = df1.loc[:, 'price_range'].apply(lambda x: create_price_tye(x))
-    df1["country"] = df1.loc[:, "country_code"].apply(lambda x: country_name(x))
-    df1["color_name"] = df1.loc[:, "rating_color"].apply(lambda x: color_name(x))
-
-    # 4. Categorizando tipo de restaurantes por 1 tipo de culinária
-    df1['cuisines'] = df1['cuisines'].astype(str)
-    df1['cuisines'] = df1.loc[:, "cuisines"].apply(lambda x: x.split(",")[0])
-
-    # 5. Removendo Linhas Duplicadas
-    df1 = df1.drop_duplicates()
-
-    # 6. Ajustando as colunas em ordem 
-    df1 = adjust_columns_order(df1)
-
-    # 7. Eliminando a possibilidade de ter espaços nas colunas Texto/ object(trim)
-    # df1.dtypes
-
-    df1.loc[:, 'restaurant_name'] = df1.loc[:, 'restaurant_name'].str.strip()
-    df1.loc[:, 'city'] = df1.loc[:, 'city'].str.strip()
-    df1.loc[:, 'address'] = df1.loc[:, 'address'].str.strip()
-    df1.loc[:, 'locality'] = df1.loc[:, 'locality'].str.strip()
-    df1.loc[:, 'locality_verbose'] = df1.loc[:, 'locality_verbose'].str.strip()
-    df1.loc[:, 'cuisines'] = df1.loc[:, 'cuisines'].str.strip()
-    df1.loc[:, 'currency'] = df1.loc[:, 'currency'].str.strip()
-    df1.loc[:, 'rating_color'] = df1.loc[:, 'rating_color'].str.strip()
-    df1.loc[:, 'rating_text'] = df1.loc[:, 'rating_text'].str.strip()
-    df1.loc[:, 'country'] = df1.loc[:, 'country'].str.strip()
-    df1.loc[:, 'color_name'] = df1.loc[:, 'color_name'].str.strip()
-
-    return df1
-
-# 6. Quantidade de Restaurantes registrados por País
+# 1. Quantidade de Restaurantes registrados por País
 #===========================================================================================
 
-def count_restaurants(df1):
-    count = df2.groupby('country')['restaurant_id'].count()
+def count_restaurants(country_stats):
+    count = country_stats['restaurants'].rename('restaurant_id')
     count_city =count.sort_values(ascending=False)
 
     fig = px.bar(count_city, title='Quantidade de Restaurantes registrados por País',text_auto = '.2s' )
@@ -199,16 +30,14 @@ def count_restaurants(df1):
     fig.update_layout(width=1000, height=500)  # Aumentar o tamanho do gráfico
     fig.update_layout(title_text="Quantidade de Restaurantes registrados por País", title_font_size=20, title_font_color="orange")  # Tornar o título mais visível
 
-    st.plotly_chart(fig)
-
     return fig
 
 
-# 7. Quantidade de cidades registradas por País
+# 2. Quantidade de cidades registradas por País
 #===========================================================================================
 
-def count_city(df1):
-    count_city = df2.groupby('country')['city'].nunique()
+def count_city(country_stats):
+    count_city = country_stats['cities'].rename('city')
     count_city_2 =count_city.sort_values(ascending=False)
     
     # Plotando o grafico:
@@ -221,15 +50,13 @@ def count_city(df1):
     fig.update_layout(width=1000, height=500)  # Aumentar o tamanho do gráfico
     fig.update_layout(title_text="Quantidade de Cidades registradas por País", title_font_size=20, title_font_color="orange")  # Tornar o título mais visível
 
-    st.plotly_chart(fig)
-
     return fig
 
-# 8. Média de avaliações feitas por País
+# 3. Média de avaliações feitas por País
 #===========================================================================================
 
-def country_mean_votes(df1):
-    count_city = df2.groupby('country')['votes'].mean().sort_values(ascending=False)
+def country_mean_votes(country_stats):
+    count_city = country_stats['votes_mean'].rename('votes').sort_values(ascending=False)
     count_city_2 =count_city.sort_values(ascending=False)
 
     fig = px.bar(count_city_2, title='Média de avaliações feitas por País', text_auto = '.2s' )
@@ -240,15 +67,13 @@ def country_mean_votes(df1):
     fig.update_layout( plot_bgcolor='black')
     fig.update_layout(title_text="Média de avaliações feitas por País", title_font_size=20, title_font_color="orange")  # Tornar o título mais visível
 
-    st.plotly_chart(fig)
-
     return fig
 
-# 9. Avaliação média por País
+# 4. Avaliação média por País
 #===========================================================================================
 
-def country_mean_rating(df1):
-    df =df2.groupby('country')['aggregate_rating'].mean().round(2).sort_values(ascending=False)
+def country_mean_rating(country_stats):
+    df =country_stats['rating_mean'].rename('aggregate_rating').round(2).sort_values(ascending=False)
 
     fig = px.bar(df, title='Avaliações média por País', text_auto = '.2s' )
     fig.update_xaxes(title="Paises", title_font_color= 'orange', ticks = 'outside', tickfont_color= 'red')
@@ -258,17 +83,15 @@ def country_mean_rating(df1):
     fig.update_layout( plot_bgcolor='black')
     fig.update_layout(title_text="Avaliação média por País", title_font_size=20, title_font_color="orange")  # Tornar o título mais visível
 
-    st.plotly_chart(fig)
-
     return fig
 
-# 10. Média de prato para duas Pessoas
+# 5. Média de prato para duas Pessoas
 #===========================================================================================
 
-def country_mean_fortwo(df1):
+def country_mean_fortwo(country_stats):
 # Criando o DataFrame df_aux com os dados
-    df_aux = (df1.loc[:, ['country', 'average_cost_for_two']].groupby(['country']).mean()
-            .sort_values('average_cost_for_two', ascending=False).reset_index())
+    df_aux = (country_stats['cost_mean'].rename('average_cost_for_two')
+            .sort_values(ascending=False).reset_index())
 
 
     # Criando o gráfico
@@ -300,9 +123,6 @@ def country_mean_fortwo(df1):
     fig.update_layout(xaxis_title=dict(font=dict(color='orange')))
     fig.update_layout(yaxis_title=dict(font=dict(color='orange')))
 
-    # Exibindo o gráfico
-    st.plotly_chart(fig)
-    
     return fig
 
 
@@ -319,14 +139,9 @@ def country_mean_fortwo(df1):
 
 #----------------------------------------------------- Inicio da Estrutura Lógica do Código ---------------------------------------------
 
-# DataFrame importado
-#============================================
-dataFrame = pd.read_csv( 'Datasets/zomato.csv' )
-
-# Limpando os dados
+# Resumo por país (calculado uma vez; o filtro apenas seleciona linhas)
 #============================================
-df1 = clean_code(dataFrame)
-df2 = df1.copy()
+country_stats = load_country_summary()
 
 
 #====================================================================================================
@@ -352,8 +167,8 @@ st.sidebar.markdown( '# Filtros' )
 
 country_options = st.sidebar.multiselect(
     'Escolha os Paises que Deseja visualizar as Informações ',
-    ["Brazil", "England", "Qatar", "South Africa", "Canada", "Australia", "Philippines", "United States of America", "Singapure", "United Arab Emirates", "India", "Indonesia", "New Zeland", "Sri Lanka", "Turkey"],
-    default = ["Brazil", "England", "Qatar", "South Africa", "Canada", "Australia", "Philippines", "United States of America", "Singapure", "United Arab Emirates", "India", "Indonesia", "New Zeland", "Sri Lanka", "Turkey"],)
+    DEFAULT_COUNTRIES,
+    default = DEFAULT_COUNTRIES,)
 
 #====================================================================================================
 # Habilidatação dos filtros
@@ -361,8 +176,7 @@ country_options = st.sidebar.multiselect(
 
 # Filtro País
 
-linhas = df1['country'].isin(country_options)
-df2 = df1.loc[linhas, :]
+df2 = select_countries(country_stats, country_options)
 
 
 st.sidebar.markdown( """___""")
@@ -380,7 +194,7 @@ st.markdown('# 🌎 Visão Países')
 with st.container():
 
     # Quantidade de Restaurantes registrados por país
-    count_restaurants(df1)
+    show_figure('count_restaurants', country_options, lambda: count_restaurants(df2))
 
 st.markdown( """___""")
 
@@ -390,7 +204,7 @@ st.markdown( """___""")
 with st.container():
 
     # Quantidade de cidades registradas por País
-    count_city(df1)
+    show_figure('count_city', country_options, lambda: count_city(df2))
 
 st.markdown( """___""")
 
@@ -403,12 +217,12 @@ col1, col2 = st.columns(2)
 
 with col1:
     # Gráfico 1 (Média de avaliações feitas por País)
-    country_mean_votes(df1)
+    show_figure('country_mean_votes', country_options, lambda: country_mean_votes(df2))
 
 
 with col2:
     # Gráfico 2 (Avaliação média por País)
-    country_mean_rating(df1)
+    show_figure('country_mean_rating', country_options, lambda: country_mean_rating(df2))
 
 st.markdown( """___""")
 
@@ -416,7 +230,7 @@ st.markdown( """___""")
 
 st.container()
 
-country_mean_fortwo(df1)
+show_figure('country_mean_fortwo', country_options, lambda: country_mean_fortwo(df2))
 
 st.markdown( """___""")
 
@@ -0,0 +1,134 @@
+# Bibliotecas
+#============================================
+import streamlit as st
+
+from PIL import Image
+from fomezero import lazy_import, load_nearby_index, paginated_table
+
+# Só importados quando o mapa é desenhado
+folium = lazy_import('folium')
+streamlit_folium = lazy_import('streamlit_folium')
+
+
+st.set_page_config(page_title="Nearby", page_icon="📍", layout="wide", initial_sidebar_state='auto')
+
+# Ponto inicial da busca (Nova Délhi, a cidade com mais restaurantes na base)
+PONTO_INICIAL = (28.6139, 77.2090)
+
+# Pinos desenhados no mapa (a tabela mostra todos os encontrados)
+MAX_PINOS = 500
+
+COLUNAS = ['restaurant_name', 'city', 'cuisines', 'aggregate_rating', 'average_cost_for_two', 'currency',
+           'distance_km']
+
+# Funções
+#============================================
+
+#  1. Mapa com o ponto escolhido e os restaurantes encontrados
+#=================================================================
+
+def mapa_proximos(ponto, proximos, raio_km=None):
+    map1 = folium.Map(location=ponto, zoom_start=13 if raio_km is None or raio_km <= 5 else 11)
+
+    folium.Marker(ponto, tooltip='Ponto escolhido', icon=folium.Icon(color='red', icon='screenshot')).add_to(map1)
+    if raio_km is not None:
+        folium.Circle(ponto, radius=raio_km * 1000, color='red', fill=False).add_to(map1)
+
+    for row in proximos.head(MAX_PINOS).itertuples():
+        folium.CircleMarker(
+            (row.latitude, row.longitude),
+            radius=6,
+            color='green',
+            fill=True,
+            tooltip=row.restaurant_name,
+            popup=folium.Popup(
+                f'<div style="width: 250px;"><b>{row.restaurant_name}</b><br><br>'
+                f'Type: {row.cuisines}<br>'
+                f'Nota: {row.aggregate_rating}/5.0<br>'
+                f'Distância: {row.distance_km:.2f} km</div>'),
+        ).add_to(map1)
+
+    return map1
+
+
+#----------------------------------------------------- Inicio da Estrutura Lógica do Código ---------------------------------------------
+
+# Índice espacial dos restaurantes (cache compartilhado entre sessões)
+#============================================
+nearby = load_nearby_index()
+
+# Ponto inicial na primeira execução; depois os campos guardam o próprio valor
+st.session_state.setdefault('latitude', PONTO_INICIAL[0])
+st.session_state.setdefault('longitude', PONTO_INICIAL[1])
+
+# Um clique no mapa (tratado no fim da execução anterior) vira o novo ponto
+if 'ponto_clicado' in st.session_state:
+    st.session_state['latitude'], st.session_state['longitude'] = st.session_state.pop('ponto_clicado')
+
+#====================================================================================================
+# SIDEBAR
+#====================================================================================================
+
+image = Image.open( "logo.png")
+st.sidebar.image( image, width=180)
+st.sidebar.markdown( '# O seu mais novo Restaurante Favorito' )
+st.sidebar.markdown( """___""")
+
+st.sidebar.markdown('## Ponto de busca:')
+
+latitude = st.sidebar.number_input('Latitude', min_value=-90.0, max_value=90.0,
+                                   format='%.5f', key='latitude')
+longitude = st.sidebar.number_input('Longitude', min_value=-180.0, max_value=180.0,
+                                    format='%.5f', key='longitude')
+
+st.sidebar.markdown('## Filtros:')
+
+busca = st.sidebar.radio('Buscar', ['Mais próximos', 'Dentro de um raio'])
+if busca == 'Mais próximos':
+    quantidade = st.sidebar.slider('Quantidade de restaurantes', 1, 100, 10)
+else:
+    raio_km = st.sidebar.slider('Raio (km)', 0.5, 50.0, 5.0, step=0.5)
+
+culinarias = st.sidebar.multiselect('Tipos de culinária', list(nearby.cuisine_names))
+nota_minima = st.sidebar.slider('Nota mínima', 0.0, 5.0, 0.0, step=0.1)
+
+st.sidebar.markdown( """___""")
+st.sidebar.markdown( '##### Desenvolvido por Comunidade DS')
+st.sidebar.markdown( '###### Cientista de Dados: Renato Sanches Ruiz')
+
+#====================================================================================================
+# Habilidatação dos filtros
+#====================================================================================================
+
+filtros = {'cuisines': culinarias, 'min_rating': nota_minima if nota_minima > 0 else None}
+if busca == 'Mais próximos':
+    proximos = nearby.nearest(latitude, longitude, quantidade, **filtros)
+    raio_km = None
+else:
+    proximos = nearby.within(latitude, longitude, raio_km, **filtros)
+
+#============================================
+#  Layout no Streamlit
+#============================================
+
+st.write('# 📍 Restaurantes Próximos')
+st.markdown("#### Clique no mapa para buscar os restaurantes mais próximos do ponto")
+
+with st.container():
+    mapa = streamlit_folium.st_folium(mapa_proximos((latitude, longitude), proximos, raio_km), key='mapa_proximos',
+                                      width=1024, height=460, returned_objects=['last_clicked'])
+
+    if len(proximos) > MAX_PINOS:
+        st.caption(f'O mapa mostra os {MAX_PINOS} restaurantes mais próximos de {len(proximos)} encontrados.')
+
+st.markdown("""___""")
+
+with st.container():
+    paginated_table(proximos, key='tabela_proximos', columns=COLUNAS)
+
+# Novo clique: guarda o ponto e executa a página de novo com ele
+clique = (mapa or {}).get('last_clicked')
+if clique is not None and clique != st.session_state.get('ultimo_clique'):
+    st.session_state['ultimo_clique'] = clique
+    st.session_state['ponto_clicado'] = (clique['lat'], clique['lng'])
+    st.rerun()
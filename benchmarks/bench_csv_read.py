@@ -0,0 +1,86 @@
+""" Benchmark: leitura do CSV inteira e inferida x colunas e tipos declarados
+
+    Mede tempo de parse e pico de memória (RSS) de cada forma de leitura, cada
+    uma em um processo separado, no CSV do projeto e em uma cópia replicada.
+    O pico de RSS vem de resource.getrusage (Linux).
+
+    Uso (na raiz do projeto):
+        python benchmarks/bench_csv_read.py [--copies 50]
+"""
+# Bibliotecas
+#============================================
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from fomezero.data_loader import DATASET_PATH
+
+
+# 1. Formas de leitura comparadas
+#============================================
+
+VARIANTS = {
+    'antes (todas as colunas, tipos inferidos)': "pd.read_csv(path)",
+    'depois (usecols + dtype, engine c)': "read_csv(path, engine='c')",
+    'depois (usecols + dtype, engine pyarrow)': "read_csv(path)",
+}
+
+# Executado em um processo novo para que o pico de RSS seja só da leitura
+MEASURE = """
+import resource, sys, time
+import pandas as pd
+from fomezero.data_loader import read_csv
+path = sys.argv[1]
+start = time.perf_counter()
+df = {expr}
+elapsed = time.perf_counter() - start
+print(elapsed, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, len(df))
+"""
+
+
+def measure(expr, path):
+    out = subprocess.run([sys.executable, '-c', MEASURE.format(expr=expr), path],
+                         cwd=ROOT, capture_output=True, text=True, check=True).stdout.split()
+    return float(out[0]), float(out[1]), int(out[2])
+
+
+# 2. Dados
+#============================================
+
+def replicated_csv(path, copies):
+    """ Grava um CSV com o corpo de `path` repetido `copies` vezes. """
+    with open(path, encoding='utf-8') as file:
+        header = file.readline()
+        body = file.read()
+    if not body.endswith('\n'):
+        body += '\n'
+    tmp = tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False, encoding='utf-8')
+    with tmp:
+        tmp.write(header)
+        for _ in range(copies):
+            tmp.write(body)
+    return tmp.name
+
+
+def run(name, path):
+    for label, expr in VARIANTS.items():
+        elapsed, peak_mb, rows = measure(expr, path)
+        print(f'{name:>16} | {rows:>8} linhas | {label:<42} | {elapsed * 1e3:8.1f} ms | pico {peak_mb:7.1f} MB')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark de leitura do CSV')
+    parser.add_argument('--copies', type=int, default=50, help='repetições do CSV na cópia grande')
+    args = parser.parse_args()
+
+    run('zomato.csv', DATASET_PATH)
+    big = replicated_csv(DATASET_PATH, args.copies)
+    try:
+        run(f'zomato.csv x{args.copies}', big)
+    finally:
+        os.remove(big)
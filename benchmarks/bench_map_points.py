@@ -0,0 +1,86 @@
+""" Benchmark: pontos do mapa agrupados na renderização x tabela pré-calculada
+
+    Compara o caminho antigo do group_map() (groupby de 6 chaves + median a
+    cada renderização) com a tabela geo.map_points() montada uma vez, no CSV
+    do projeto e em um conjunto sintético de 1M de linhas.
+
+    Uso (na raiz do projeto):
+        python benchmarks/bench_map_points.py [--rows 1000000]
+"""
+# Bibliotecas
+#============================================
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fomezero.data_loader import DATASET_PATH, apply_schema, columnar_cache_path, read_columnar_cache
+from fomezero.geo import map_points
+
+
+# 1. Caminho antigo (referência)
+#============================================
+
+def legacy_map_points(df1):
+    # Agrupamento que o group_map() fazia a cada renderização
+    return (df1.loc[:, ['city', 'aggregate_rating', 'currency', 'cuisines', 'color_name', 'restaurant_id','latitude', 'longitude', 'average_cost_for_two', 'restaurant_name']]
+                .groupby(['city', 'cuisines','color_name', 'currency', 'restaurant_id', 'restaurant_name'], observed=True)
+                .median().reset_index())
+
+
+# 2. Dados
+#============================================
+
+def load_clean_frame():
+    dataframe = read_columnar_cache(columnar_cache_path(DATASET_PATH))
+    if dataframe is None:
+        sys.exit('Cache colunar ausente: rode python -m fomezero.build')
+    return dataframe
+
+
+def replicate(dataframe, rows, seed=0):
+    """ Replica o dataframe até `rows` linhas, com restaurant_id únicos. """
+    rng = np.random.default_rng(seed)
+    picks = rng.integers(0, len(dataframe), rows)
+    big = dataframe.iloc[picks].reset_index(drop=True)
+    big['restaurant_id'] = np.arange(rows, dtype='int64')
+    return apply_schema(big)
+
+
+# 3. Medição
+#============================================
+
+def best_of(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def run(name, dataframe, repeat):
+    countries = dataframe['country'].unique().tolist()
+    points = map_points(dataframe)
+
+    legacy = best_of(lambda: legacy_map_points(dataframe.loc[dataframe['country'].isin(countries), :]), repeat)
+    build = best_of(lambda: map_points(dataframe), repeat)
+    render = best_of(lambda: points.loc[points['country'].isin(countries), :], repeat)
+
+    print(f'{name:>12} | {len(dataframe):>9} linhas | antigo (por renderização) {legacy * 1e3:9.1f} ms '
+          f'| novo: carga única {build * 1e3:9.1f} ms, por renderização {render * 1e3:7.1f} ms')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0].strip())
+    parser.add_argument('--rows', type=int, default=1_000_000, help='linhas do conjunto sintético')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    df1 = load_clean_frame()
+    run('zomato.csv', df1, args.repeat)
+    run('sintético', replicate(df1, args.rows), args.repeat)
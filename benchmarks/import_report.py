@@ -0,0 +1,74 @@
+""" Relatório de tempo de import por página
+
+    Executa cada página headless (streamlit AppTest) em um processo novo com
+    python -X importtime e soma o tempo próprio de cada módulo importado a
+    partir da execução da página, agrupado por pacote de primeiro nível.
+    Cada página é medida com imports preguiçosos (padrão) e com
+    FOMEZERO_LAZY_IMPORTS=0.
+
+    Uso (na raiz do projeto):
+        python benchmarks/import_report.py [--top 8]
+"""
+# Bibliotecas
+#============================================
+import argparse
+import os
+import re
+import subprocess
+import sys
+from collections import Counter
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PAGES = ['Home.py', 'Pages/1_Countries.py', 'Pages/2_Cities.py', 'Pages/3_Cuisines.py', 'Pages/4_Nearby.py']
+MARKER = '--- fomezero: página ---'
+
+# Imports do próprio AppTest ficam antes do marcador e não entram na conta
+PAGE_RUN = """
+import sys
+from streamlit.testing.v1 import AppTest
+sys.path.insert(0, '.')
+print({marker!r}, file=sys.stderr, flush=True)
+at = AppTest.from_file(sys.argv[1], default_timeout=600).run()
+if at.exception:
+    sys.exit(at.exception[0].value)
+"""
+
+LINE = re.compile(r'import time:\s+(\d+) \|\s+\d+ \|( *)(\S+)')
+
+
+# 1. Medição
+#============================================
+
+def page_imports(page, lazy):
+    """ Esta função mede os imports feitos pela página
+
+        Input: caminho da página, imports preguiçosos
+        Output: Counter pacote -> microssegundos (tempo próprio)
+    """
+    env = dict(os.environ, FOMEZERO_LAZY_IMPORTS='1' if lazy else '0')
+    stderr = subprocess.run([sys.executable, '-X', 'importtime', '-c', PAGE_RUN.format(marker=MARKER),
+                             page],
+                            cwd=ROOT, env=env, capture_output=True, text=True, check=True).stderr
+
+    costs = Counter()
+    for line in stderr.split(MARKER, 1)[1].splitlines():
+        match = LINE.match(line)
+        if match:
+            costs[match.group(3).split('.')[0]] += int(match.group(1))
+    return costs
+
+
+def report(page, label, costs, top):
+    total = sum(costs.values()) / 1e3
+    parts = ', '.join(f'{name} {micro / 1e3:.0f}' for name, micro in costs.most_common(top))
+    print(f'{page:<22} | {label:<23} | {total:8.0f} ms | {parts}')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Tempo de import por página')
+    parser.add_argument('--top', type=int, default=8, help='pacotes mais caros listados por página')
+    args = parser.parse_args()
+
+    for page in PAGES:
+        for label, lazy in [('FOMEZERO_LAZY_IMPORTS=0', False), ('lazy (padrão)', True)]:
+            report(page, label, page_imports(page, lazy), args.top)
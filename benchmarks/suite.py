@@ -0,0 +1,553 @@
+""" Suíte de benchmarks: carga, limpeza, filtro, agregação e renderização
+
+    Mede cada etapa da camada de dados (fomezero), cada função de gráfico e de
+    mapa das páginas (render.*) e a execução headless de cada página
+    (streamlit AppTest) no CSV do projeto e em bases sintéticas
+    10x / 100x / 1000x maiores (fomezero.synthetic). Para cada etapa guarda o melhor tempo e o
+    pico de memória:
+        - etapas da camada de dados: pico alocado pelo Python/NumPy (tracemalloc)
+        - páginas: pico de RSS do processo (cada página roda em um processo novo)
+
+    As etapas check.* conferem os atalhos (rankings top-K, versões por
+    partição, ingestão em streaming, índice espacial) com o resultado
+    calculado direto e falham com AssertionError se divergirem.
+
+    Os resultados são comparados com um baseline salvo (benchmarks/baseline.json);
+    o script termina com código 1 se alguma etapa ficou mais lenta ou usou mais
+    memória do que a tolerância permite.
+
+    Uso (na raiz do projeto):
+        python benchmarks/suite.py                        # 1x e 10x, compara com o baseline
+        python benchmarks/suite.py --scales 1,10,100,1000 --no-pages
+        python benchmarks/suite.py --save-baseline        # grava o baseline desta máquina
+"""
+# Bibliotecas
+#============================================
+import argparse
+import ast
+import contextlib
+import io
+import json
+import os
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+from haversine import haversine_vector
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from fomezero.aggregates import (CountrySummaryAccumulator, country_distinct_sets, country_distinct_sets_partitioned,
+                                 country_summary, country_summary_partitioned, cuisine_partials,
+                                 cuisine_partials_partitioned, cuisine_stats, merge_countries, select_countries)
+from fomezero.cleaning import DEFAULT_COUNTRIES, clean_code
+from fomezero.data_loader import (CACHE_DIR, DATASET_PATH, apply_schema, clean_partitioned, read_columnar_cache,
+                                  read_csv, write_columnar_cache)
+from fomezero.filter_index import FilterIndex
+from fomezero.geo import geo_grid, geo_grid_partitioned, grid_cells, map_points
+from fomezero.ingest import STREAM_SCHEMA, stream_clean_csv
+from fomezero.nearby import NearbyIndex
+from fomezero.rankings import RESTAURANT_COLUMNS, page_rankings
+from fomezero.synthetic import generate
+from fomezero.views import RowView
+
+BASELINE_PATH = os.path.join(ROOT, 'benchmarks', 'baseline.json')
+# Página -> filtro trocado na terceira execução (países ou ponto de busca)
+PAGES = {
+    'Home.py': 'countries',
+    'Pages/1_Countries.py': 'countries',
+    'Pages/2_Cities.py': 'countries',
+    'Pages/3_Cuisines.py': 'countries',
+    'Pages/4_Nearby.py': 'point',
+}
+
+
+# 1. Bases sintéticas
+#============================================
+
+def scaled_csv(scale, data_dir):
+    """ Esta função gera (uma vez) a base sintética `scale` vezes maior que o CSV do projeto
+
+        Input: fator de escala, pasta das bases
+        Output: caminho do CSV
+    """
+    if scale == 1:
+        return DATASET_PATH
+
+    path = os.path.join(data_dir, f'synthetic-x{scale}.csv')
+    if not os.path.exists(path):
+        os.makedirs(data_dir, exist_ok=True)
+        rows = len(pd.read_csv(DATASET_PATH, usecols=[0]))
+        generate(path, rows * scale, seed=scale)
+    return path
+
+
+# 2. Medição
+#============================================
+
+def measure(fn, repeat):
+    """ Melhor tempo em `repeat` execuções e o pico de memória de uma execução extra. """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {'seconds': min(times), 'peak_mb': peak / 2**20}
+
+
+def data_stages(path, cache_path):
+    """ Esta função monta as etapas da camada de dados para um CSV
+
+        Cada etapa recebe como entrada o resultado já pronto da etapa anterior.
+
+        Input: caminho do CSV, caminho do Feather temporário
+        Output: lista de (nome, função sem argumentos)
+    """
+    countries = DEFAULT_COUNTRIES
+    raw = read_csv(path)
+    clean = clean_code(raw)
+    df = apply_schema(clean)
+    write_columnar_cache(df, cache_path)
+
+    index = FilterIndex(df)
+    summary = country_summary(df)
+    partials = {'summary': summary, 'distinct': country_distinct_sets(df, summary.index)}
+    rankings = page_rankings(df)
+    shared = shared_city(df)
+    shared_rankings = page_rankings(shared)
+    selections = country_selections(df, shared)
+    cuisines = cuisine_partials(df)
+    nearby = NearbyIndex(df)
+    points = map_points(df)
+    grid = geo_grid(points)
+    point = tuple(nearby.coordinates[0])
+
+    return [
+        ('load.read_csv', lambda: read_csv(path)),
+        ('load.columnar_cache', lambda: read_columnar_cache(cache_path)),
+        ('clean.clean_code', lambda: clean_code(raw)),
+        ('clean.apply_schema', lambda: apply_schema(clean)),
+        ('filter.isin_loc', lambda: df.loc[df['country'].isin(countries), :]),
+        ('filter.index_build', lambda: FilterIndex(df)),
+        ('filter.index_query', lambda: index.positions(index.where(country=countries))),
+        ('filter.nearby_build', lambda: NearbyIndex(df)),
+        ('filter.nearby_query', lambda: nearby.nearest_positions(*point, k=10, min_rating=4.0)),
+        ('aggregate.country_summary', lambda: country_summary(df)),
+        ('aggregate.country_partials', lambda: country_distinct_sets(df, summary.index)),
+        ('aggregate.merge_countries', lambda: merge_countries(partials, countries)),
+        ('aggregate.rankings_build', lambda: page_rankings(df)),
+        ('aggregate.rankings_query', lambda: [ranking.top(countries, 10) for ranking in rankings.values()]),
+        ('check.rankings', lambda: check_rankings(df, rankings, selections)),
+        ('check.rankings_shared_city', lambda: check_rankings(shared, shared_rankings, selections)),
+        ('check.partitioned', lambda: check_partitioned(raw, clean, df, points, selections)),
+        ('check.streaming', lambda: check_streaming(path, raw, clean, df)),
+        ('check.nearby', lambda: check_nearby(nearby)),
+        ('aggregate.cuisine_partials', lambda: cuisine_partials(df)),
+        ('aggregate.cuisine_stats', lambda: cuisine_stats(cuisines, countries)),
+        ('aggregate.geo_grid', lambda: geo_grid(points)),
+        ('aggregate.grid_cells', lambda: [grid_cells(grid, zoom, countries) for zoom in grid]),
+        ('render.map_points', lambda: map_points(df)),
+    ] + render_stages(df, index, summary, rankings, cuisines, points, grid, nearby, point, countries)
+
+
+def page_functions(page):
+    """ Esta função carrega as funções de uma página sem executá-la
+
+        Executa só os imports, as funções, as constantes (nomes em
+        maiúsculas) e os lazy_import do topo do arquivo; o restante da
+        página usa o runtime do Streamlit.
+
+        Input: caminho da página (relativo à raiz do projeto)
+        Output: dict nome -> objeto
+    """
+    with open(os.path.join(ROOT, page), encoding='utf-8') as file:
+        tree = ast.parse(file.read())
+
+    keep = []
+    for node in tree.body:
+        if isinstance(node, (ast.Import, ast.ImportFrom, ast.FunctionDef)):
+            keep.append(node)
+        elif isinstance(node, ast.Assign) and all(isinstance(target, ast.Name) for target in node.targets):
+            lazy = isinstance(node.value, ast.Call) and getattr(node.value.func, 'id', None) == 'lazy_import'
+            if lazy or all(target.id.isupper() for target in node.targets):
+                keep.append(node)
+
+    namespace = {'__name__': os.path.splitext(os.path.basename(page))[0]}
+    exec(compile(ast.Module(keep, type_ignores=[]), page, 'exec'), namespace)
+    return namespace
+
+
+def quiet(fn):
+    """ Executa fn sem o que ela imprime no console (algumas funções das páginas imprimem). """
+    def run():
+        with contextlib.redirect_stdout(io.StringIO()):
+            return fn()
+    return run
+
+
+def render_stages(df, index, summary, rankings, cuisines, points, grid, nearby, point, countries):
+    """ Esta função monta uma etapa para cada função de gráfico e de mapa das páginas
+
+        Cada função recebe as mesmas entradas que a página passa para ela
+        com o filtro padrão; os mapas incluem a geração do HTML.
+
+        Input: resultados prontos das etapas da camada de dados, ponto de
+               busca e lista de países
+        Output: lista de (nome, função sem argumentos)
+    """
+    home = page_functions('Home.py')
+    page1 = page_functions('Pages/1_Countries.py')
+    page2 = page_functions('Pages/2_Cities.py')
+    page3 = page_functions('Pages/3_Cuisines.py')
+    page4 = page_functions('Pages/4_Nearby.py')
+
+    country_stats = select_countries(summary, countries)
+    rows = RowView(df, index.positions(index.where(country=countries)))
+    stats = cuisine_stats(cuisines, countries)
+    selected = points.loc[points['country'].isin(countries), :]
+    folium = home['folium']
+
+    stages = [(f'render.1_Countries.{name}', lambda fn=page1[name]: fn(country_stats))
+              for name in ('count_restaurants', 'count_city', 'country_mean_votes', 'country_mean_rating',
+                           'country_mean_fortwo')]
+    stages += [(f'render.2_Cities.{name}', lambda fn=page2[name]: fn(rankings, countries))
+               for name in ('city_restaurants', 'avaliacao_acima_de_quatro', 'avaliacao_menor_que_dois',
+                            'culinarias_distintas')]
+    stages += [
+        ('render.2_Cities.contagem_restaurante_menorque_dois',
+         quiet(lambda: page2['contagem_restaurante_menorque_dois'](rows))),
+        ('render.3_Cuisines.melhores_tipos_culinarias', lambda: page3['melhores_tipos_culinarias'](stats, 'rating_mean')),
+        ('render.3_Cuisines.avaliacao_media', lambda: page3['avaliacao_media'](stats, 'rating_mean')),
+        ('render.Home.map_html', lambda: home['map_html'](selected)),
+        ('render.Home.density_map',
+         lambda: folium.Figure().add_child(home['build_density_map'](grid, countries)).render()),
+        ('render.4_Nearby.mapa_proximos',
+         lambda: page4['mapa_proximos'](point, nearby.nearest(*point, k=10)).get_root().render()),
+    ]
+    return stages
+
+
+# 3. Conferências
+#============================================
+
+# Cada ranking de page_rankings() calculado direto no pandas
+REFERENCE_RANKINGS = {
+    'city_restaurants': lambda df: df.groupby(['city', 'country'], observed=True).size(),
+    'city_rating_above_4': lambda df: df[df['aggregate_rating'] > 4].groupby('city', observed=True)['aggregate_rating'].mean(),
+    'city_rating_below_2_5': lambda df: df[df['aggregate_rating'] < 2.5].groupby('city', observed=True)['aggregate_rating'].mean(),
+    'city_cuisines': lambda df: df.groupby('city', observed=True)['cuisines'].nunique(),
+    'restaurant_rating': lambda df: df.groupby(RESTAURANT_COLUMNS, observed=True)['aggregate_rating'].mean(),
+}
+
+
+def shared_city(dataframe):
+    """ Esta função dá a uma cidade do segundo país o nome de uma cidade do primeiro
+
+        Assim a mesma cidade (pelo nome) aparece em dois países, caso que os
+        rankings por cidade precisam recombinar.
+
+        Input: Dataframe limpo
+        Output: cópia do Dataframe
+    """
+    first, second = dataframe['country'].cat.categories[:2]
+    target = dataframe.loc[dataframe['country'] == first, 'city'].iloc[0]
+    renamed = dataframe.loc[dataframe['country'] == second, 'city'].iloc[0]
+    city = dataframe['city'].astype(str).where(dataframe['city'] != renamed, target)
+    return dataframe.assign(city=city.astype('category'))
+
+
+def country_selections(dataframe, shared, count=6, seed=0):
+    """ Seleções de países para as conferências: todos, os padrões, os dois
+        países da cidade compartilhada e algumas sorteadas.
+    """
+    rng = np.random.default_rng(seed)
+    countries = list(dataframe['country'].cat.categories)
+    sharing = list(shared.groupby('city', observed=True)['country'].nunique().loc[lambda n: n > 1].index)
+    selections = [countries, list(DEFAULT_COUNTRIES),
+                  list(shared.loc[shared['city'].isin(sharing), 'country'].unique())]
+    for _ in range(count):
+        size = rng.integers(1, len(countries) + 1)
+        selections.append(list(rng.choice(countries, size, replace=False)))
+    return selections
+
+
+def check_rankings(dataframe, rankings, selections, k=10):
+    """ Esta função confere os rankings top-K / bottom-K com o pandas
+
+        Para cada seleção confere a sequência dos k valores e o valor de cada
+        grupo devolvido. A ordem entre grupos empatados não é conferida.
+
+        Input: Dataframe limpo, resultado de page_rankings() para ele,
+               seleções de países, quantidade de grupos
+        Output: None (AssertionError na primeira divergência)
+    """
+    for countries in selections:
+        selected = dataframe[dataframe['country'].isin(countries)]
+        for name, reference in REFERENCE_RANKINGS.items():
+            expected = reference(selected)
+            values = np.sort(expected.to_numpy(dtype=float))
+            for largest in (True, False):
+                ranking = rankings[name]
+                found = ranking.top(countries, k) if largest else ranking.bottom(countries, k)
+                best = values[::-1][:k] if largest else values[:k]
+
+                groups = pd.MultiIndex.from_frame(found.drop(columns='value'))
+                if expected.index.nlevels == 1:
+                    groups = groups.get_level_values(0)
+                where = f'{name} ({"top" if largest else "bottom"}) em {countries}'
+                assert groups.is_unique, where
+                np.testing.assert_allclose(found['value'], best, err_msg=where)
+                np.testing.assert_allclose(found['value'], expected.loc[groups], err_msg=where)
+
+
+def check_partitioned(raw, clean, dataframe, points, selections, workers=4):
+    """ Esta função confere as versões por partição (FOMEZERO_WORKERS) com as seriais
+
+        Input: CSV lido, resultado de clean_code(), Dataframe limpo com
+               schema, pontos do mapa, seleções de países, processos
+        Output: None (AssertionError na primeira divergência)
+    """
+    pd.testing.assert_frame_equal(clean_partitioned(raw, workers), clean)
+
+    summary = country_summary(dataframe)
+    pd.testing.assert_frame_equal(country_summary_partitioned(dataframe, workers), summary)
+    pd.testing.assert_frame_equal(cuisine_partials_partitioned(dataframe, workers), cuisine_partials(dataframe))
+
+    # Os bits seguem outra ordem: confere as uniões
+    serial = {'summary': summary, 'distinct': country_distinct_sets(dataframe, summary.index)}
+    partitioned = {'summary': summary, 'distinct': country_distinct_sets_partitioned(dataframe, summary.index,
+                                                                                      workers=workers)}
+    for countries in selections:
+        assert merge_countries(partitioned, countries) == merge_countries(serial, countries), countries
+
+    # As células saem agrupadas por país: confere na mesma ordem
+    keys = ['country', 'currency', 'row', 'col']
+    partitioned = geo_grid_partitioned(points, workers)
+    for zoom, cells in geo_grid(points).items():
+        pd.testing.assert_frame_equal(partitioned[zoom].sort_values(keys, ignore_index=True),
+                                      cells.sort_values(keys, ignore_index=True), obj=f'zoom {zoom}')
+
+
+def assert_same_rows(left, right, where):
+    """ Mesmas colunas, tipos, índice e valores, comparados pelo hash de cada linha
+
+        assert_frame_equal compara colunas de texto valor a valor e leva
+        segundos nas bases 10x maiores.
+    """
+    pd.testing.assert_index_equal(left.columns, right.columns, obj=where)
+    pd.testing.assert_series_equal(left.dtypes, right.dtypes, obj=where)
+    assert np.array_equal(pd.util.hash_pandas_object(left).to_numpy(),
+                          pd.util.hash_pandas_object(right).to_numpy()), where
+
+
+def check_streaming(path, raw, clean, dataframe, chunk_counts=(9, 4, 1)):
+    """ Esta função confere a ingestão em streaming com a limpeza em memória
+
+        Para cada quantidade de blocos (blocos que não dividem o arquivo por
+        igual e um bloco único), os blocos concatenados precisam ser iguais a
+        clean_code() e o resumo acumulado igual a country_summary().
+
+        Input: caminho do CSV, CSV lido, resultado de clean_code(), Dataframe
+               limpo com schema, quantidades de blocos
+        Output: None (AssertionError na primeira divergência)
+    """
+    expected = country_summary(dataframe)
+    for count in chunk_counts:
+        chunk_rows = -(-len(raw) // count)
+        # compact_every=2: a compactação do acumulador também é exercitada
+        summary = CountrySummaryAccumulator(compact_every=2)
+        chunks = []
+        for rows, _ in stream_clean_csv(path, chunk_rows):
+            chunks.append(rows)
+            if not rows.empty:
+                summary.add(rows.astype(STREAM_SCHEMA))
+
+        assert_same_rows(pd.concat(chunks), clean, f'blocos de {chunk_rows} linhas')
+        pd.testing.assert_frame_equal(summary.result(), expected, check_index_type=False,
+                                      check_categorical=False, obj=f'resumo em blocos de {chunk_rows} linhas')
+
+
+def check_nearby(nearby, queries=8, k=10, radius_km=25, seed=0):
+    """ Esta função confere o índice espacial com a distância haversine de todos os restaurantes
+
+        Consulta pontos sorteados entre os restaurantes (deslocados de até
+        ~10 km) e pontos fixos longe deles, sem filtro, com culinárias, com
+        nota mínima e com os dois.
+
+        Input: NearbyIndex, quantidade de pontos sorteados, k, raio (km)
+        Output: None (AssertionError na primeira divergência)
+    """
+    rng = np.random.default_rng(seed)
+    picked = nearby.coordinates[rng.integers(0, len(nearby), queries)] + rng.uniform(-0.1, 0.1, (queries, 2))
+    points = [tuple(point) for point in picked] + [(0.0, 0.0), (-89.0, 179.0)]
+
+    cuisines = list(nearby.points['cuisines'].value_counts().index[:2])
+    filters = [{}, {'cuisines': cuisines}, {'min_rating': 4.5}, {'cuisines': cuisines, 'min_rating': 4.0},
+               {'cuisines': ['(culinária inexistente)']}]
+
+    for latitude, longitude in points:
+        distances = haversine_vector(nearby.coordinates, [latitude, longitude], comb=True)[0]
+        for options in filters:
+            passes = np.ones(len(nearby), dtype=bool)
+            if 'cuisines' in options:
+                passes &= nearby.points['cuisines'].isin(options['cuisines']).to_numpy()
+            if 'min_rating' in options:
+                passes &= nearby.ratings >= options['min_rating']
+            where = f'({latitude:.4f}, {longitude:.4f}) {options}'
+
+            found = nearby.nearest(latitude, longitude, k, **options)
+            np.testing.assert_allclose(found['distance_km'], np.sort(distances[passes])[:k], err_msg=where)
+
+            # Na borda do raio a corda e a haversine podem divergir por arredondamento
+            positions, found = nearby.within_positions(latitude, longitude, radius_km, **options)
+            assert np.all(np.diff(found) >= 0), where
+            assert passes[positions].all() and np.all(distances[positions] <= radius_km + 1e-6), where
+            inside = np.flatnonzero(passes & (distances <= radius_km - 1e-6))
+            assert np.isin(inside, positions).all(), where
+
+
+# Executado em um processo novo por página: primeira execução (cache em disco
+# já gerado), nova execução sem mudanças e execução com outra seleção de países
+# (ou, na página de restaurantes próximos, com outro ponto de busca)
+PAGE_RUN = """
+import json, os, resource, sys, time
+sys.path.insert(0, os.getcwd())
+from streamlit.testing.v1 import AppTest
+from fomezero import DEFAULT_COUNTRIES
+
+def timed(run):
+    start = time.perf_counter()
+    at = run()
+    if at.exception:
+        sys.exit(at.exception[0].value)
+    return time.perf_counter() - start
+
+def new_point():
+    at.number_input(key='latitude').set_value(-23.55)
+    return at.number_input(key='longitude').set_value(-46.63).run()
+
+at = AppTest.from_file(sys.argv[1], default_timeout=3600)
+result = {'cold': timed(at.run), 'warm': timed(at.run)}
+if sys.argv[2] == 'point':
+    result['new_selection'] = timed(new_point)
+else:
+    result['new_selection'] = timed(lambda: at.sidebar.multiselect[0].set_value(DEFAULT_COUNTRIES[:5]).run())
+result['peak_rss_mb'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+print(json.dumps(result))
+"""
+
+
+def page_stages(path, cache_dir):
+    """ Esta função executa cada página headless e mede tempo e pico de RSS
+
+        Input: caminho do CSV, pasta do cache colunar desta escala
+        Output: dict nome da etapa -> medição
+    """
+    env = dict(os.environ, FOMEZERO_DATASET=path, FOMEZERO_CACHE_DIR=cache_dir)
+    subprocess.run([sys.executable, '-m', 'fomezero.build', path], cwd=ROOT, env=env, check=True,
+                   capture_output=True)
+
+    results = {}
+    for page, change in PAGES.items():
+        out = subprocess.run([sys.executable, '-c', PAGE_RUN, page, change], cwd=ROOT, env=env,
+                             capture_output=True, text=True, check=True).stdout
+        run = json.loads(out.strip().splitlines()[-1])
+        name = os.path.splitext(os.path.basename(page))[0]
+        for step in ('cold', 'warm', 'new_selection'):
+            results[f'page.{name}.{step}'] = {'seconds': run[step], 'peak_mb': run['peak_rss_mb']}
+    return results
+
+
+def run_scale(scale, data_dir, repeat, pages):
+    path = scaled_csv(scale, data_dir)
+    cache_dir = os.path.join(data_dir, f'cache-x{scale}')
+    os.makedirs(cache_dir, exist_ok=True)
+
+    results = {}
+    for name, fn in data_stages(path, os.path.join(cache_dir, 'bench.feather')):
+        # Conferências só precisam rodar uma vez
+        results[name] = measure(fn, 1 if name.startswith('check.') else repeat)
+        report(scale, name, results[name])
+    if pages:
+        for name, result in page_stages(path, cache_dir).items():
+            results[name] = result
+            report(scale, name, result)
+    return results
+
+
+def report(scale, name, result):
+    print(f'{scale:>5}x | {name:<52} | {result["seconds"] * 1e3:10.1f} ms | pico {result["peak_mb"]:8.1f} MB',
+          flush=True)
+
+
+# 4. Comparação com o baseline
+#============================================
+
+def regressions(results, baseline, time_tolerance, memory_tolerance, min_seconds=0.02, min_mb=5):
+    """ Esta função lista as etapas piores que o baseline além da tolerância
+
+        Diferenças absolutas menores que min_seconds / min_mb são ignoradas,
+        para que etapas muito rápidas não falhem por ruído.
+
+        Input: resultados, baseline, tolerâncias relativas (0.5 = 50%)
+        Output: lista de mensagens
+    """
+    found = []
+    for key, result in results.items():
+        base = baseline.get(key)
+        if base is None:
+            continue
+        seconds, base_seconds = result['seconds'], base['seconds']
+        if seconds > base_seconds * (1 + time_tolerance) and seconds - base_seconds > min_seconds:
+            found.append(f'{key}: {base_seconds * 1e3:.1f} ms -> {seconds * 1e3:.1f} ms')
+        peak, base_peak = result['peak_mb'], base['peak_mb']
+        if peak > base_peak * (1 + memory_tolerance) and peak - base_peak > min_mb:
+            found.append(f'{key}: pico {base_peak:.1f} MB -> {peak:.1f} MB')
+    return found
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmarks do Fome Zero')
+    parser.add_argument('--scales', default='1,10', help='fatores de escala separados por vírgula')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--no-pages', action='store_true', help='não executa as páginas')
+    parser.add_argument('--data-dir', default=os.path.join(CACHE_DIR, 'bench'))
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--save-baseline', action='store_true')
+    parser.add_argument('--time-tolerance', type=float, default=0.5)
+    parser.add_argument('--memory-tolerance', type=float, default=0.25)
+    args = parser.parse_args()
+
+    results = {}
+    for scale in map(int, args.scales.split(',')):
+        for name, result in run_scale(scale, args.data_dir, args.repeat, not args.no_pages).items():
+            results[f'{scale}x/{name}'] = result
+
+    if args.save_baseline:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline, encoding='utf-8') as file:
+                baseline = json.load(file)
+        baseline.update(results)
+        with open(args.baseline, 'w', encoding='utf-8') as file:
+            json.dump(baseline, file, indent=2, sort_keys=True)
+            file.write('\n')
+        print(f'Baseline gravado em {args.baseline}')
+    elif os.path.exists(args.baseline):
+        with open(args.baseline, encoding='utf-8') as file:
+            baseline = json.load(file)
+        found = regressions(results, baseline, args.time_tolerance, args.memory_tolerance)
+        for message in found:
+            print('REGRESSÃO', message)
+        if found:
+            sys.exit(1)
+        print('Sem regressões em relação ao baseline')
@@ -0,0 +1,91 @@
+""" Camada de dados compartilhada pelas páginas do Fome Zero
+
+    Tudo o que é derivado do CSV (dataframe limpo, resumos e tabelas
+    auxiliares) é calculado uma vez por processo e por versão do arquivo;
+    as páginas apenas consomem os objetos abaixo.
+
+    Os módulos usados por uma só página (geo, nearby, tables) são importados
+    no primeiro acesso a um dos seus nomes, como em lazy_import.
+"""
+import importlib
+
+from .aggregates import (
+    cuisine_stats,
+    load_country_partials,
+    load_country_summary,
+    load_cuisine_partials,
+    merge_countries,
+    select_countries,
+)
+from .cleaning import COLORS, COUNTRIES, DEFAULT_COUNTRIES, clean_code
+from .data_loader import DATASET_PATH, build_columnar_cache, file_signature, load_dataset
+from .figure_cache import cached_figure, figure_cache, show_figure
+from .filter_index import FilterIndex, load_filter_index
+from .lazy import LAZY_IMPORTS, lazy_import
+from .rankings import Ranking, build_ranking, first_k, load_rankings, select_top
+from .render_cache import LRUCache
+from .views import RowView
+
+# Nome -> módulo importado só quando o nome é usado
+LAZY_EXPORTS = {
+    'GRID_MAX_ZOOM': 'geo',
+    'GRID_MIN_ZOOM': 'geo',
+    'cell_size': 'geo',
+    'grid_cells': 'geo',
+    'load_geo_grid': 'geo',
+    'load_map_points': 'geo',
+    'NearbyIndex': 'nearby',
+    'load_nearby_index': 'nearby',
+    'paginated_table': 'tables',
+}
+
+__all__ = [
+    'COLORS',
+    'COUNTRIES',
+    'DATASET_PATH',
+    'DEFAULT_COUNTRIES',
+    'FilterIndex',
+    'GRID_MAX_ZOOM',
+    'GRID_MIN_ZOOM',
+    'LRUCache',
+    'NearbyIndex',
+    'Ranking',
+    'RowView',
+    'build_columnar_cache',
+    'build_ranking',
+    'cached_figure',
+    'cell_size',
+    'clean_code',
+    'cuisine_stats',
+    'figure_cache',
+    'file_signature',
+    'first_k',
+    'grid_cells',
+    'lazy_import',
+    'load_country_partials',
+    'load_country_summary',
+    'load_cuisine_partials',
+    'load_dataset',
+    'load_filter_index',
+    'load_geo_grid',
+    'load_map_points',
+    'load_nearby_index',
+    'load_rankings',
+    'merge_countries',
+    'paginated_table',
+    'select_countries',
+    'select_top',
+    'show_figure',
+]
+
+
+def __getattr__(name):
+    if name not in LAZY_EXPORTS:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    return getattr(importlib.import_module(f'.{LAZY_EXPORTS[name]}', __name__), name)
+
+
+# FOMEZERO_LAZY_IMPORTS=0: tudo importado na carga, como os módulos das páginas
+if not LAZY_IMPORTS:
+    for _name in LAZY_EXPORTS:
+        globals()[_name] = __getattr__(_name)
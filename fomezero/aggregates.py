@@ -0,0 +1,310 @@
+# Bibliotecas
+#============================================
+import functools
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+import streamlit as st
+
+from .data_loader import COLUMNAR_CACHE, DATASET_PATH, columnar_cache_path, file_signature, load_dataset
+from .parallel import WORKERS, map_partitions
+
+
+# 1. Resumo por país
+#============================================
+
+def country_summary(dataframe):
+    """ Esta função calcula, em uma única agregação, o resumo de cada país
+
+        Além das médias usadas nos gráficos, guarda as somas e contagens que
+        permitem recombinar os valores de vários países.
+
+        Input: Dataframe limpo (completo)
+        Output: Dataframe indexado por country
+    """
+    summary = dataframe.groupby('country', observed=True).agg(
+        restaurants=('restaurant_id', 'count'),
+        cities=('city', 'nunique'),
+        votes_sum=('votes', 'sum'),
+        rating_sum=('aggregate_rating', 'sum'),
+        cost_sum=('average_cost_for_two', 'sum'),
+    )
+    return _add_means(summary)
+
+
+def _add_means(summary):
+    summary['votes_mean'] = summary['votes_sum'] / summary['restaurants']
+    summary['rating_mean'] = summary['rating_sum'] / summary['restaurants']
+    summary['cost_mean'] = summary['cost_sum'] / summary['restaurants']
+    return summary
+
+
+class CountrySummaryAccumulator:
+    """ Monta o mesmo resultado de country_summary() recebendo os dados em blocos
+
+        Usado pela ingestão em streaming: cada bloco contribui com suas somas e
+        com os pares (country, city) distintos, que são compactados de tempos
+        em tempos para a memória não crescer com o número de blocos.
+    """
+
+    def __init__(self, compact_every=64):
+        self.compact_every = compact_every
+        self._sums = []
+        self._cities = []
+
+    def add(self, chunk):
+        self._sums.append(chunk.groupby('country', observed=True).agg(
+            restaurants=('restaurant_id', 'count'),
+            votes_sum=('votes', 'sum'),
+            rating_sum=('aggregate_rating', 'sum'),
+            cost_sum=('average_cost_for_two', 'sum'),
+        ))
+        self._cities.append(chunk[['country', 'city']].drop_duplicates())
+        if len(self._sums) >= self.compact_every:
+            self._compact()
+
+    def _compact(self):
+        self._sums = [pd.concat(self._sums).groupby(level=0).sum()]
+        self._cities = [pd.concat(self._cities).drop_duplicates()]
+
+    def result(self):
+        if not self._sums:
+            return None
+        self._compact()
+        summary = self._sums[0]
+        summary.insert(1, 'cities', self._cities[0].groupby('country').size())
+        return _add_means(summary)
+
+
+def country_summary_partitioned(dataframe, workers=None):
+    """ country_summary() calculada por país em paralelo (FOMEZERO_WORKERS). """
+    parts = map_partitions(dataframe, 'country', country_summary, workers)
+    if not parts:
+        return country_summary(dataframe)
+    return pd.concat(parts).sort_index()
+
+
+def summary_cache_path(cache_path):
+    """ Arquivo do resumo por país gravado ao lado do cache colunar.
+
+        O nome carrega o mesmo hash do CSV que o cache colunar, então o
+        arquivo só é encontrado enquanto corresponde ao conteúdo atual.
+    """
+    return cache_path[:-len('.feather')] + '.summary.feather'
+
+
+def write_country_summary(summary, cache_path):
+    """ Grava o resumo por país (ex.: o da ingestão em streaming) ao lado do cache colunar. """
+    path = summary_cache_path(cache_path)
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    feather.write_feather(pa.Table.from_pandas(summary, preserve_index=True), tmp_path)
+    os.replace(tmp_path, path)
+    return path
+
+
+def read_country_summary(cache_path):
+    """ Lê o resumo por país gravado ao lado do cache colunar; None se não existir. """
+    path = summary_cache_path(cache_path)
+    if not os.path.exists(path):
+        return None
+    summary = feather.read_table(path).to_pandas()
+    # Mesmo índice categórico de country_summary()
+    summary.index = summary.index.astype('category')
+    return summary
+
+
+@st.cache_resource(max_entries=1, show_spinner=False)
+def _cached_country_summary(path, signature):
+    # Resumo já acumulado pela ingestão em streaming para este CSV
+    if COLUMNAR_CACHE:
+        summary = read_country_summary(columnar_cache_path(path))
+        if summary is not None:
+            return summary
+    if WORKERS > 1:
+        return country_summary_partitioned(load_dataset(path))
+    return country_summary(load_dataset(path))
+
+
+def load_country_summary(path=DATASET_PATH):
+    """ Retorna o resumo por país, calculado uma vez para cada versão do CSV
+        (ou lido do arquivo gravado pela ingestão em streaming).
+
+        Input: caminho do CSV
+        Output: Dataframe indexado por country
+    """
+    return _cached_country_summary(path, file_signature(path))
+
+
+def select_countries(summary, countries):
+    """ Mantém apenas as linhas dos países selecionados no filtro. """
+    return summary.loc[summary.index.isin(countries)]
+
+
+# 2. Estados parciais por país (mescláveis)
+#============================================
+
+# Colunas cuja contagem de valores distintos precisa ser recombinada entre países
+DISTINCT_COLUMNS = ('restaurant_id', 'city', 'cuisines')
+
+
+def country_distinct_sets(dataframe, countries, columns=DISTINCT_COLUMNS):
+    """ Esta função monta, para cada coluna, o conjunto exato de valores de cada país
+
+        Cada conjunto é uma linha de bits (um bit por valor distinto da coluna),
+        então a união de vários países é um OR entre poucas linhas.
+
+        Input: Dataframe limpo (completo), índice de países (linhas do resultado)
+        Output: dict coluna -> matriz uint8 (países x bits empacotados)
+    """
+    rows = countries.get_indexer(dataframe['country'])
+    sets = {}
+    for col in columns:
+        codes, uniques = pd.factorize(dataframe[col])
+        present = np.zeros((len(countries), len(uniques)), dtype=bool)
+        present[rows, codes] = True
+        sets[col] = np.packbits(present, axis=1)
+    return sets
+
+
+def country_values(dataframe, columns=DISTINCT_COLUMNS):
+    """ País de uma partição e os valores distintos de cada coluna nele. """
+    return dataframe['country'].iloc[0], {col: np.asarray(dataframe[col].unique()) for col in columns}
+
+
+def country_distinct_sets_partitioned(dataframe, countries, columns=DISTINCT_COLUMNS, workers=None):
+    """ country_distinct_sets() com os valores de cada país levantados em paralelo
+        (FOMEZERO_WORKERS).
+
+        Os bits seguem a ordem em que os países chegam, não a da base, então
+        as matrizes diferem da versão serial; as uniões de merge_countries()
+        são as mesmas.
+    """
+    parts = map_partitions(dataframe, 'country', functools.partial(country_values, columns=columns), workers)
+    if not parts:
+        return country_distinct_sets(dataframe, countries, columns)
+
+    part_rows = countries.get_indexer([country for country, _ in parts])
+    sets = {}
+    for col in columns:
+        values = [part[col] for _, part in parts]
+        codes, uniques = pd.factorize(np.concatenate(values))
+        rows = np.repeat(part_rows, [len(part) for part in values])
+        present = np.zeros((len(countries), len(uniques)), dtype=bool)
+        present[rows, codes] = True
+        sets[col] = np.packbits(present, axis=1)
+    return sets
+
+
+@st.cache_resource(max_entries=1, show_spinner=False)
+def _cached_country_partials(path, signature):
+    summary = load_country_summary(path)
+    distinct = country_distinct_sets_partitioned if WORKERS > 1 else country_distinct_sets
+    return {
+        'summary': summary,
+        'distinct': distinct(load_dataset(path), summary.index),
+    }
+
+
+def load_country_partials(path=DATASET_PATH):
+    """ Retorna o resumo por país junto com os conjuntos distintos de cada país.
+
+        Input: caminho do CSV
+        Output: dict com 'summary' (Dataframe) e 'distinct' (dict de matrizes)
+    """
+    return _cached_country_partials(path, file_signature(path))
+
+
+def merge_countries(partials, countries):
+    """ Esta função combina os estados parciais dos países selecionados
+
+        O custo depende apenas do número de países e de valores distintos,
+        nunca do número de restaurantes.
+
+        Input: resultado de load_country_partials(), lista de países
+        Output: dict com as quantidades de restaurantes, países, cidades,
+                culinárias e o total de avaliações
+    """
+    summary = partials['summary']
+    rows = np.flatnonzero(summary.index.isin(countries))
+
+    merged = {
+        'countries': len(rows),
+        'votes': int(summary['votes_sum'].iloc[rows].sum()),
+    }
+    for col, bits in partials['distinct'].items():
+        union = np.bitwise_or.reduce(bits[rows], axis=0)
+        merged[col] = int(np.unpackbits(union).sum()) if len(rows) else 0
+    return merged
+
+
+# 3. Estatísticas de avaliação por culinária
+#============================================
+
+def cuisine_partials(dataframe):
+    """ Esta função soma, por (país, culinária), o que as médias de avaliação precisam
+
+        Input: Dataframe limpo (completo)
+        Output: Dataframe indexado por (country, cuisines)
+    """
+    weighted = dataframe['aggregate_rating'] * dataframe['votes']
+    return (dataframe.assign(weighted_sum=weighted)
+                     .groupby(['country', 'cuisines'], observed=True)
+                     .agg(restaurants=('aggregate_rating', 'count'),
+                          rating_sum=('aggregate_rating', 'sum'),
+                          weighted_sum=('weighted_sum', 'sum'),
+                          votes_sum=('votes', 'sum')))
+
+
+def cuisine_partials_partitioned(dataframe, workers=None):
+    """ cuisine_partials() calculada por país em paralelo (FOMEZERO_WORKERS). """
+    parts = map_partitions(dataframe, 'country', cuisine_partials, workers)
+    if not parts:
+        return cuisine_partials(dataframe)
+    return pd.concat(parts).sort_index()
+
+
+@st.cache_resource(max_entries=1, show_spinner=False)
+def _cached_cuisine_partials(path, signature):
+    if WORKERS > 1:
+        return cuisine_partials_partitioned(load_dataset(path))
+    return cuisine_partials(load_dataset(path))
+
+
+def load_cuisine_partials(path=DATASET_PATH):
+    """ Retorna as somas por (país, culinária), calculadas uma vez por versão do CSV.
+
+        Input: caminho do CSV
+        Output: Dataframe
+    """
+    return _cached_cuisine_partials(path, file_signature(path))
+
+
+def cuisine_stats(partials, countries, prior_weight=None):
+    """ Esta função monta a tabela de avaliações por culinária dos países selecionados
+
+        Colunas:
+            restaurants   -> quantidade de restaurantes
+            rating_mean   -> média simples das notas
+            weighted_mean -> média ponderada pelo número de votos
+            bayes_mean    -> média suavizada em direção à média geral, com
+                             peso prior_weight (padrão: mediana de restaurantes
+                             por culinária), para culinárias com poucos restaurantes
+
+        Input: resultado de load_cuisine_partials(), lista de países, peso do prior
+        Output: Dataframe indexado por cuisines
+    """
+    selected = partials.loc[partials.index.get_level_values('country').isin(countries)]
+    stats = selected.groupby(level='cuisines', observed=True).sum()
+
+    count = stats['restaurants']
+    stats['rating_mean'] = stats['rating_sum'] / count
+    stats['weighted_mean'] = (stats['weighted_sum'] / stats['votes_sum']).where(stats['votes_sum'] > 0, stats['rating_mean'])
+
+    if prior_weight is None:
+        prior_weight = count.median() if len(count) else 0
+    overall = stats['rating_sum'].sum() / count.sum() if len(count) else 0
+    stats['bayes_mean'] = (stats['rating_sum'] + prior_weight * overall) / (count + prior_weight)
+    return stats[['restaurants', 'rating_mean', 'weighted_mean', 'bayes_mean']]
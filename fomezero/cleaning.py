@@ -0,0 +1,183 @@
+# Bibliotecas
+#============================================
+import inflection
+
+
+# Tabelas de códigos e limpeza do dataset do Zomato
+#============================================
+
+# 1. Preenchimento do nome dos países
+#============================================
+
+COUNTRIES = {
+    1: "India",
+    14: "Australia",
+    30: "Brazil",
+    37: "Canada",
+    94: "Indonesia",
+    148: "New Zeland",
+    162: "Philippines",
+    166: "Qatar",
+    184: "Singapure",
+    189: "South Africa",
+    191: "Sri Lanka",
+    208: "Turkey",
+    214: "United Arab Emirates",
+    215: "England",
+    216: "United States of America",
+}
+
+# Ordem dos países no filtro das páginas (todos selecionados por padrão)
+DEFAULT_COUNTRIES = ["Brazil", "England", "Qatar", "South Africa", "Canada", "Australia", "Philippines", "United States of America", "Singapure", "United Arab Emirates", "India", "Indonesia", "New Zeland", "Sri Lanka", "Turkey"]
+
+#===============================================
+def lookup(series, table):
+    """ Traduz uma coluna inteira de códigos usando o dicionário informado.
+        Assim como o acesso COUNTRIES[codigo], um código desconhecido gera KeyError.
+    """
+    names = series.map(table)
+    missing = names.isna()
+    if missing.any():
+        raise KeyError(series[missing].iloc[0])
+    return names
+
+
+def country_name(country_ids):
+    return lookup(country_ids, COUNTRIES)
+
+
+
+# 2. Criação do Tipo de Categoria de Comida
+#===============================================
+
+PRICE_TYPES = {
+    1: "cheap",
+    2: "normal",
+    3: "expensive",
+}
+def create_price_tye(price_range):
+    # Qualquer faixa fora da tabela é "gourmet"
+    return price_range.map(PRICE_TYPES).fillna("gourmet")
+
+
+# 3. Criação do nome das Cores 
+#================================================
+
+COLORS = {
+    "3F7E00": "darkgreen",
+    "5BA829": "green",
+    "9ACD32": "lightgreen",
+    "CDD614": "orange",
+    "FFBA00": "red",
+    "CBCBC8": "darkred",
+    "FF7800": "darkred",
+}
+def color_name(color_codes):
+    return lookup(color_codes, COLORS)
+
+#================================================
+
+def adjust_columns_order(dataframe):
+    new_cols_order = [
+        "restaurant_id",
+        "restaurant_name",
+        "country",
+        "city",
+        "address",
+        "locality",
+        "locality_verbose",
+        "longitude",
+        "latitude",
+        "cuisines",
+        "price_type",
+        "average_cost_for_two",
+        "currency",
+        "has_table_booking",
+        "has_online_delivery",
+        "is_delivering_now",
+        "aggregate_rating",
+        "rating_color",
+        "color_name",
+        "rating_text",
+        "votes",
+    ]
+
+    return dataframe.loc[:, new_cols_order]
+
+
+#  4. Renomeando as colunas do Dataframe
+#============================================
+
+def rename_columns(dataframe):
+    df = dataframe.copy(deep=False)  # copy-on-write: só os nomes mudam
+    title = lambda x: inflection.titleize(x)
+    snakecase = lambda x: inflection.underscore(x)
+    spaces = lambda x: x.replace(" ", "")
+    cols_old = list(df.columns)
+    cols_old = list(map(title, cols_old))
+    cols_old = list(map(spaces, cols_old))
+    cols_new = list(map(snakecase, cols_old))
+    df.columns = cols_new
+    return df
+
+
+#  5. Limpeza dos dados
+#==============================================
+
+def prepare_rows(df1):
+    """ Etapas 1 a 3 da limpeza: tudo o que precisa acontecer antes da
+        remoção das linhas duplicadas.
+    """
+
+    # 1. Removendo os valores NaN
+    df1 = df1.dropna()
+
+    # 2. Renomeando as colunas
+    df1 = rename_columns(df1)
+
+    # 3. Categorizando tipo de restaurantes por 1 tipo de culinária
+    df1['cuisines'] = df1['cuisines'].astype(str).str.split(',', n=1).str[0]
+
+    return df1
+
+
+def finish_rows(df1):
+    """ Etapas 5 a 7 da limpeza, aplicadas às linhas já sem duplicadas. """
+
+    # 5. Criação de colunas (calculadas depois da remoção das duplicadas,
+    #    pois dependem apenas de colunas já existentes)
+    df1['price_type'] = create_price_tye(df1['price_range'])
+    df1['country'] = country_name(df1['country_code'])
+    df1['color_name'] = color_name(df1['rating_color'])
+
+    # 6. Ajustando as colunas em ordem 
+    df1 = adjust_columns_order(df1)
+
+    # 7. Eliminando a possibilidade de ter espaços nas colunas Texto/ object(trim)
+    text_cols = df1.select_dtypes('object').columns
+    df1[text_cols] = df1[text_cols].apply(lambda col: col.str.strip())
+
+    return df1
+
+
+def clean_code(df1):
+    """ Esta função tem a responsabilidade de limpar o dataframe
+
+        Tipos de limpeza:
+        1. Removendo os valores NaN
+        2. Renomeando as colunas
+        3. Categorizando tipo de restaurantes por 1 tipo de culinária
+        4. Removendo Linhas Duplicadas
+        5. Criação de colunas
+        6. Ajustando as colunas em ordem 
+        7. Eliminando a possibilidade de ter espaços nas colunas Texto/ object(trim)    
+
+        Input: Dataframe
+        Output: Dataframe 
+    """
+    df1 = prepare_rows(df1)
+
+    # 4. Removendo Linhas Duplicadas
+    df1 = df1.drop_duplicates()
+
+    return finish_rows(df1)
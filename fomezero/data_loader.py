@@ -0,0 +1,294 @@
+# Bibliotecas
+#============================================
+import functools
+import glob
+import hashlib
+import logging
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+import streamlit as st
+
+from .cleaning import clean_code
+from .parallel import WORKERS, map_partitions
+
+
+# O frame compartilhado entre as sessões nunca é alterado: com o copy-on-write
+# ativo, qualquer escrita feita por uma página gera uma cópia local.
+pd.set_option('mode.copy_on_write', True)
+
+# FOMEZERO_DATASET aponta as páginas para outro CSV (ex.: bases sintéticas)
+DATASET_PATH = os.environ.get('FOMEZERO_DATASET', 'Datasets/zomato.csv')
+
+# Cache colunar (Arrow IPC / Feather) do dataframe já limpo.
+# FOMEZERO_COLUMNAR_CACHE=0 desativa o cache e força sempre CSV + limpeza.
+CACHE_DIR = os.environ.get('FOMEZERO_CACHE_DIR', 'Datasets/cache')
+COLUMNAR_CACHE = os.environ.get('FOMEZERO_COLUMNAR_CACHE', '1') != '0'
+
+# Com FOMEZERO_INGEST_MEMORY_MB definido, o cache é gerado lendo o CSV em
+# blocos (fomezero.ingest), com o pico de memória limitado a esse orçamento.
+INGEST_MEMORY_MB = os.environ.get('FOMEZERO_INGEST_MEMORY_MB')
+
+# Incrementar sempre que a limpeza mudar o formato do dataframe gerado,
+# para que arquivos antigos deixem de ser considerados válidos.
+CACHE_VERSION = 3
+
+# Tipos compactos aplicados ao dataframe limpo. aggregate_rating continua
+# float64 porque é exibido e usado em médias nos gráficos, onde o float32
+# aparece como 4.599999904632568.
+SCHEMA = {
+    'restaurant_id': 'int32',
+    'country': 'category',
+    'city': 'category',
+    'longitude': 'float32',
+    'latitude': 'float32',
+    'cuisines': 'category',
+    'price_type': 'category',
+    'average_cost_for_two': 'int32',
+    'currency': 'category',
+    'has_table_booking': 'int8',
+    'has_online_delivery': 'int8',
+    'is_delivering_now': 'int8',
+    'rating_color': 'category',
+    'color_name': 'category',
+    'rating_text': 'category',
+    'votes': 'int32',
+}
+
+# Colunas lidas do CSV e seus tipos. "Switch to order menu" não é usada em
+# nenhuma página e fica de fora da leitura.
+CSV_COLUMNS = {
+    'Restaurant ID': 'int64',
+    'Restaurant Name': 'object',
+    'Country Code': 'int16',
+    'City': 'object',
+    'Address': 'object',
+    'Locality': 'object',
+    'Locality Verbose': 'object',
+    'Longitude': 'float64',
+    'Latitude': 'float64',
+    'Cuisines': 'object',
+    'Average Cost for two': 'int64',
+    'Currency': 'object',
+    'Has Table booking': 'int8',
+    'Has Online delivery': 'int8',
+    'Is delivering now': 'int8',
+    'Price range': 'int8',
+    'Aggregate rating': 'float64',
+    'Rating color': 'object',
+    'Rating text': 'object',
+    'Votes': 'int64',
+}
+
+# Os mesmos tipos com inteiros anuláveis, para a leitura em blocos: lá o erro
+# de tipo só aparece no meio da iteração, quando não dá mais para refazer a
+# leitura com inferência. Os vazios ficam como <NA> até o dropna() da limpeza.
+NULLABLE_CSV_COLUMNS = {col: dtype.capitalize() if dtype.startswith('int') else dtype
+                        for col, dtype in CSV_COLUMNS.items()}
+
+logger = logging.getLogger(__name__)
+
+
+# 1. Assinatura do arquivo de dados
+#============================================
+
+def file_signature(path=DATASET_PATH):
+    """ Retorna (mtime, tamanho) do arquivo, usado como chave do cache.
+
+        Quando o CSV é substituído a assinatura muda e o próximo acesso
+        carrega e limpa os dados novamente.
+    """
+    stat = os.stat(path)
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def file_hash(path=DATASET_PATH, chunk_size=1 << 20):
+    """ Retorna o sha256 do conteúdo do arquivo (lido em blocos de 1 MB). """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+@functools.lru_cache(maxsize=8)
+def _signature_hash(path, signature):
+    # Cada versão do arquivo é lida para o hash uma única vez por processo
+    return file_hash(path)
+
+
+def read_csv(path=DATASET_PATH, engine='pyarrow', **kwargs):
+    """ Lê apenas as colunas de CSV_COLUMNS, já com os tipos declarados.
+
+        Se alguma coluna inteira vier com valores vazios (o que impede o tipo
+        declarado), a leitura é refeita com inferência de tipos; essas linhas
+        são descartadas depois pelo dropna() da limpeza.
+        Para leitura em blocos use read_csv_chunks().
+    """
+    try:
+        return pd.read_csv(path, usecols=list(CSV_COLUMNS), dtype=CSV_COLUMNS, engine=engine, **kwargs)
+    except ValueError:
+        logger.warning('Tipos de CSV_COLUMNS não se aplicam a %s; lendo com inferência de tipos', path)
+        return pd.read_csv(path, usecols=list(CSV_COLUMNS), **kwargs)
+
+
+def read_csv_chunks(path=DATASET_PATH, chunk_rows=100_000):
+    """ Lê as colunas de CSV_COLUMNS em blocos de chunk_rows linhas.
+
+        Os inteiros vêm como tipos anuláveis (NULLABLE_CSV_COLUMNS), então
+        um valor vazio não interrompe a leitura; depois do dropna() o bloco
+        pode voltar aos tipos de CSV_COLUMNS.
+    """
+    return pd.read_csv(path, usecols=list(CSV_COLUMNS), dtype=NULLABLE_CSV_COLUMNS, engine='c',
+                       chunksize=chunk_rows)
+
+
+# 2. Tipos compactos
+#============================================
+
+def apply_schema(dataframe, schema=SCHEMA):
+    """ Converte as colunas para os tipos compactos definidos em SCHEMA.
+
+        Inteiros só são reduzidos quando todos os valores cabem no novo tipo;
+        caso contrário é gerado ValueError em vez de estourar silenciosamente.
+    """
+    for col, dtype in schema.items():
+        if dtype != 'category' and np.issubdtype(dtype, np.integer):
+            limits = np.iinfo(dtype)
+            if dataframe[col].min() < limits.min or dataframe[col].max() > limits.max:
+                raise ValueError(f"Coluna '{col}' não cabe em {dtype}")
+    return dataframe.astype(schema)
+
+
+def memory_report(before, after):
+    """ Compara o uso de memória (em bytes) coluna a coluna.
+
+        Input: dataframe original, dataframe com SCHEMA aplicado
+        Output: Dataframe com as colunas before, after e saved
+    """
+    report = pd.DataFrame({
+        'before': before.memory_usage(index=False, deep=True),
+        'after': after.memory_usage(index=False, deep=True),
+    })
+    report['saved'] = report['before'] - report['after']
+    return report
+
+
+def clean_partitioned(raw, workers=None):
+    """ clean_code() aplicada por país em paralelo (FOMEZERO_WORKERS).
+
+        Duplicadas sempre têm o mesmo Country Code, então limpar cada país
+        separadamente e reordenar pelo índice original dá o mesmo resultado
+        da execução serial.
+    """
+    parts = map_partitions(raw, 'Country Code', clean_code, workers)
+    if not parts:
+        return clean_code(raw)
+    return pd.concat(parts).sort_index(kind='stable')
+
+
+def _clean_csv(path):
+    raw = read_csv(path)
+    dataframe = clean_partitioned(raw) if WORKERS > 1 else clean_code(raw)
+    compact = apply_schema(dataframe)
+    report = memory_report(dataframe, compact)
+    logger.info('Schema compacto: %.1f MB -> %.1f MB (%.1f MB economizados)',
+                report['before'].sum() / 1e6, report['after'].sum() / 1e6, report['saved'].sum() / 1e6)
+    return compact
+
+
+# 3. Cache colunar do dataframe limpo
+#============================================
+
+def columnar_cache_path(path=DATASET_PATH, content_hash=None):
+    """ Caminho do arquivo Feather correspondente ao conteúdo atual do CSV. """
+    if content_hash is None:
+        content_hash = _signature_hash(path, file_signature(path))
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(CACHE_DIR, f'{stem}-v{CACHE_VERSION}-{content_hash[:16]}.feather')
+
+
+def read_columnar_cache(cache_path):
+    """ Lê o arquivo Feather com memory map; retorna None se ele não existir. """
+    if not os.path.exists(cache_path):
+        return None
+    table = feather.read_table(cache_path, memory_map=True)
+    # Arquivos gravados em streaming guardam o texto sem categorias
+    return apply_schema(table.to_pandas())
+
+
+def write_columnar_cache(dataframe, cache_path):
+    """ Grava o dataframe limpo em Feather, substituindo versões antigas.
+
+        A escrita é feita em um arquivo temporário e renomeada no final, para
+        que outro processo nunca leia um arquivo pela metade.
+    """
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    table = pa.Table.from_pandas(dataframe, preserve_index=True)
+    tmp_path = f'{cache_path}.{os.getpid()}.tmp'
+    feather.write_feather(table, tmp_path)
+    publish_columnar_cache(tmp_path, cache_path)
+
+
+def publish_columnar_cache(tmp_path, cache_path):
+    """ Move o arquivo temporário para o caminho final e apaga versões antigas
+        (do cache e dos arquivos gravados ao lado dele, como o resumo por país).
+    """
+    os.replace(tmp_path, cache_path)
+
+    # Removendo caches de versões anteriores do mesmo CSV
+    prefix = cache_path.rsplit('-v', 1)[0]
+    current = cache_path[:-len('.feather')]
+    for old in glob.glob(f'{prefix}-v*-{"[0-9a-f]" * 16}*.feather'):
+        if not old.startswith(current):
+            os.remove(old)
+
+
+def build_columnar_cache(path=DATASET_PATH):
+    """ Etapa de build: lê o CSV, limpa, aplica SCHEMA e grava o cache colunar.
+
+        Input: caminho do CSV
+        Output: caminho do arquivo gerado
+    """
+    cache_path = columnar_cache_path(path)
+    write_columnar_cache(_clean_csv(path), cache_path)
+    return cache_path
+
+
+# 4. Carregamento e limpeza (uma vez por processo)
+#============================================
+
+@st.cache_resource(max_entries=1, show_spinner=False)
+def _load_clean_frame(path, signature):
+    if not COLUMNAR_CACHE:
+        return _clean_csv(path)
+
+    # Cache válido: o nome do arquivo carrega o hash do conteúdo do CSV
+    cache_path = columnar_cache_path(path)
+    dataframe = read_columnar_cache(cache_path)
+    if dataframe is None and INGEST_MEMORY_MB:
+        from .ingest import build_columnar_cache_streaming
+        build_columnar_cache_streaming(path, float(INGEST_MEMORY_MB))
+        dataframe = read_columnar_cache(cache_path)
+    if dataframe is None:
+        dataframe = _clean_csv(path)
+        write_columnar_cache(dataframe, cache_path)
+    return dataframe
+
+
+def load_dataset(path=DATASET_PATH):
+    """ Esta função entrega o dataframe limpo compartilhado pelo processo
+
+        Na primeira chamada (ou quando o arquivo muda) os dados vêm do cache
+        colunar, se ele corresponder ao conteúdo atual do CSV; caso contrário
+        o CSV é lido, limpo com clean_code(), convertido para SCHEMA e o cache
+        é regravado. Todas as sessões e páginas recebem o mesmo objeto, que
+        deve ser tratado como somente leitura.
+
+        Input: caminho do CSV
+        Output: Dataframe
+    """
+    return _load_clean_frame(path, file_signature(path))
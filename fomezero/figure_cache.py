@@ -0,0 +1,58 @@
+""" Cache de figuras Plotly compartilhado entre sessões
+
+    Cada gráfico é totalmente determinado pela seleção de países (e, em
+    alguns casos, por uma opção extra da página), então a figura pronta é
+    guardada por (gráfico, seleção, versão do CSV, opções) em um LRU único
+    por processo. Quase todo o tráfego usa a seleção padrão e vira acerto.
+"""
+# Bibliotecas
+#============================================
+import streamlit as st
+
+from .data_loader import DATASET_PATH, file_signature
+from .render_cache import LRUCache
+
+FIGURE_CACHE_ENTRIES = 512
+FIGURE_CACHE_BYTES = 128 * 1024 * 1024
+
+
+# 1. Cache
+#============================================
+
+@st.cache_resource(show_spinner=False)
+def figure_cache():
+    """ LRU único por processo com as figuras já montadas. """
+    return LRUCache(max_entries=FIGURE_CACHE_ENTRIES, max_bytes=FIGURE_CACHE_BYTES)
+
+
+def figure_key(chart, selection, path=DATASET_PATH, **options):
+    """ Chave normalizada: a ordem dos países escolhidos não muda o gráfico. """
+    return (chart, frozenset(selection), file_signature(path), tuple(sorted(options.items())))
+
+
+def cached_figure(chart, selection, build, path=DATASET_PATH, **options):
+    """ Esta função retorna a figura do cache ou a monta com build()
+
+        A figura guardada é compartilhada entre sessões e não deve ser
+        alterada por quem a recebe. O tamanho contabilizado no LRU é o do
+        JSON que o Streamlit envia ao navegador.
+
+        Input: nome do gráfico, países selecionados, função que monta a
+               figura, caminho do CSV, opções extras que mudam o gráfico
+        Output: plotly Figure
+    """
+    cache = figure_cache()
+    key = figure_key(chart, selection, path, **options)
+
+    fig = cache.get(key)
+    if fig is None:
+        fig = build()
+        cache.put(key, fig, len(fig.to_json()))
+    return fig
+
+
+def show_figure(chart, selection, build, path=DATASET_PATH, **options):
+    """ Exibe a figura (do cache ou recém-montada) com st.plotly_chart. """
+    fig = cached_figure(chart, selection, build, path, **options)
+    st.plotly_chart(fig)
+    return fig
@@ -0,0 +1,124 @@
+""" Índice de bitmaps para os filtros das páginas
+
+    Cada valor das colunas de baixa cardinalidade guarda um bitmap
+    empacotado (um bit por linha do dataframe limpo). Filtros viram
+    operações OR (valores da mesma coluna) e AND (colunas diferentes)
+    entre bitmaps, sem tocar no dataframe.
+"""
+# Bibliotecas
+#============================================
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from .data_loader import DATASET_PATH, file_signature, load_dataset
+
+FILTER_COLUMNS = (
+    'country',
+    'city',
+    'cuisines',
+    'price_type',
+    'color_name',
+    'has_online_delivery',
+    'has_table_booking',
+    'is_delivering_now',
+)
+
+
+# 1. Índice
+#============================================
+
+class FilterIndex:
+    """ Bitmaps por valor das colunas de filtro.
+
+        Os bitmaps são arrays uint8 de np.packbits e podem ser combinados
+        diretamente com & (AND), | (OR) e ~ seguido de mask() (NOT).
+
+        Exemplo:
+            bits = index.any_of('country', ['Brazil', 'India']) & index.any_of('has_table_booking', [1])
+            linhas = index.positions(bits)
+    """
+
+    def __init__(self, dataframe, columns=FILTER_COLUMNS):
+        self.rows = len(dataframe)
+        self.bitmaps = {col: self._column_bitmaps(dataframe[col]) for col in columns}
+
+    def _column_bitmaps(self, series):
+        codes, uniques = pd.factorize(series, sort=True)
+        order = np.argsort(codes, kind='stable')
+        bounds = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+
+        bitmaps = {}
+        for value, start, stop in zip(uniques.tolist(), bounds[:-1], bounds[1:]):
+            present = np.zeros(self.rows, dtype=bool)
+            present[order[start:stop]] = True
+            bitmaps[value] = np.packbits(present)
+        return bitmaps
+
+    def values(self, column):
+        """ Valores indexados da coluna, em ordem. """
+        return list(self.bitmaps[column])
+
+    def all_rows(self):
+        """ Bitmap com todas as linhas. """
+        return np.packbits(np.ones(self.rows, dtype=bool))
+
+    def no_rows(self):
+        """ Bitmap vazio. """
+        return np.zeros((self.rows + 7) // 8, dtype=np.uint8)
+
+    def mask(self, bits):
+        """ Zera os bits de preenchimento depois de um ~ (NOT). """
+        return bits & self.all_rows()
+
+    def any_of(self, column, values):
+        """ Esta função retorna o OR dos bitmaps dos valores de uma coluna
+
+            Valores que não existem na base são ignorados.
+
+            Input: nome da coluna, lista de valores
+            Output: bitmap empacotado
+        """
+        column_bitmaps = self.bitmaps[column]
+        bits = self.no_rows()
+        for value in values:
+            if value in column_bitmaps:
+                bits |= column_bitmaps[value]
+        return bits
+
+    def where(self, **filters):
+        """ Esta função combina os filtros de várias colunas com AND
+
+            Cada argumento é coluna=lista de valores (OR dentro da coluna);
+            colunas com None ficam sem filtro.
+
+            Input: filtros por coluna
+            Output: bitmap empacotado
+        """
+        bits = self.all_rows()
+        for column, values in filters.items():
+            if values is not None:
+                bits &= self.any_of(column, values)
+        return bits
+
+    def positions(self, bits):
+        """ Posições (ordem crescente) das linhas marcadas no bitmap. """
+        return np.flatnonzero(np.unpackbits(bits, count=self.rows))
+
+    def count(self, bits):
+        """ Quantidade de linhas marcadas no bitmap. """
+        return int(np.unpackbits(bits, count=self.rows).sum())
+
+
+@st.cache_resource(max_entries=1, show_spinner=False)
+def _cached_filter_index(path, signature):
+    return FilterIndex(load_dataset(path))
+
+
+def load_filter_index(path=DATASET_PATH):
+    """ Retorna o índice de filtros, montado uma vez por versão do CSV.
+
+        Input: caminho do CSV
+        Output: FilterIndex
+    """
+    return _cached_filter_index(path, file_signature(path))
@@ -0,0 +1,199 @@
+# Bibliotecas
+#============================================
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import streamlit as st
+
+from .data_loader import DATASET_PATH, file_signature, load_dataset
+from .parallel import WORKERS, map_partitions
+
+
+# 1. Pontos do mapa
+#============================================
+
+MAP_POINT_COLUMNS = [
+    'restaurant_id',
+    'restaurant_name',
+    'country',
+    'latitude',
+    'longitude',
+    'color_name',
+    'cuisines',
+    'currency',
+    'average_cost_for_two',
+    'aggregate_rating',
+]
+
+
+def _as_text(series, fmt=str):
+    """ Texto de cada linha (Arrow), formatando só os valores distintos. """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        codes, values = series.cat.codes.to_numpy(), series.cat.categories
+    else:
+        codes, values = pd.factorize(series)
+    return pa.array([fmt(value) for value in values], type=pa.string()).take(pa.array(codes))
+
+
+def popup_html(points):
+    """ Esta função monta o HTML do popup de cada ponto do mapa
+
+        A coluna inteira é montada de uma vez pelo pyarrow, em vez de um
+        f-string por restaurante na renderização.
+
+        Input: Dataframe com MAP_POINT_COLUMNS
+        Output: Series (string[pyarrow]) com o HTML de cada popup
+    """
+    html = pc.binary_join_element_wise(
+        '<div style="width: 250px;"><b>', pa.array(points['restaurant_name'], type=pa.string()),
+        '</b><br><br>Preço para dois: ', _as_text(points['average_cost_for_two'], '{:.2f}'.format),
+        ' ( ', _as_text(points['currency']),
+        ')<br> Type: ', _as_text(points['cuisines']),
+        '<br>Nota: ', _as_text(points['aggregate_rating']),
+        '/5.0</div>', '')
+    return pd.Series(html, index=points.index, dtype=pd.ArrowDtype(pa.string()))
+
+
+def map_points(dataframe):
+    """ Esta função monta a tabela de pontos usada pelo mapa
+
+        Uma linha por restaurant_id (a primeira ocorrência), apenas com as
+        colunas do mapa, com a cor do pino em texto e com o HTML do popup já
+        montado, de forma que a renderização não precise agrupar nem
+        formatar nada.
+
+        Input: Dataframe limpo (completo)
+        Output: Dataframe com MAP_POINT_COLUMNS + marker_color + popup
+    """
+    points = (dataframe.loc[:, MAP_POINT_COLUMNS]
+                       .drop_duplicates('restaurant_id')
+                       .reset_index(drop=True))
+    points['marker_color'] = points['color_name'].astype(str)
+    points['popup'] = popup_html(points)
+    return points
+
+
+@st.cache_resource(max_entries=1, show_spinner=False)
+def _cached_map_points(path, signature):
+    return map_points(load_dataset(path))
+
+
+def load_map_points(path=DATASET_PATH):
+    """ Retorna a tabela de pontos do mapa, calculada uma vez por versão do CSV.
+
+        Input: caminho do CSV
+        Output: Dataframe
+    """
+    return _cached_map_points(path, file_signature(path))
+
+
+# 2. Grade de densidade
+#============================================
+
+# Zooms do Leaflet com grade própria; fora do intervalo vale a grade mais próxima
+GRID_MIN_ZOOM = 1
+GRID_MAX_ZOOM = 10
+
+# Colunas dos pontos usadas pela grade
+GRID_COLUMNS = ['country', 'currency', 'latitude', 'longitude', 'aggregate_rating', 'average_cost_for_two']
+
+
+def cell_size(zoom):
+    """ Lado da célula da grade (em graus) no zoom: ~16 px na tela. """
+    return 22.5 / 2 ** zoom
+
+
+def grid_zoom(zoom):
+    """ Zoom da grade usada em um zoom qualquer do mapa. """
+    return min(max(int(zoom), GRID_MIN_ZOOM), GRID_MAX_ZOOM)
+
+
+def geo_grid(points):
+    """ Esta função agrega os restaurantes em uma grade por zoom do mapa
+
+        A grade do zoom mais próximo é calculada a partir das coordenadas;
+        cada célula de um zoom abaixo junta 2x2 células do zoom seguinte
+        (linha e coluna divididas por 2), sem voltar aos restaurantes.
+        Os valores ficam separados por país para que o filtro de países só
+        some as células, e por moeda para que preços em moedas diferentes
+        nunca sejam somados.
+
+        Input: tabela de pontos (map_points)
+        Output: dict zoom -> Dataframe com country, currency, row, col,
+                restaurants, rating_sum e cost_sum
+    """
+    size = cell_size(GRID_MAX_ZOOM)
+    cells = pd.DataFrame({
+        'country': points['country'],
+        'currency': points['currency'],
+        'row': np.floor((points['latitude'].to_numpy(np.float64) + 90) / size).astype(np.int64),
+        'col': np.floor((points['longitude'].to_numpy(np.float64) + 180) / size).astype(np.int64),
+        'restaurants': np.ones(len(points), dtype=np.int64),
+        'rating_sum': points['aggregate_rating'].to_numpy(np.float64),
+        'cost_sum': points['average_cost_for_two'].to_numpy(np.float64),
+    })
+
+    grid = {}
+    for zoom in range(GRID_MAX_ZOOM, GRID_MIN_ZOOM - 1, -1):
+        cells = cells.groupby(['country', 'currency', 'row', 'col'], observed=True, sort=False, as_index=False).sum()
+        grid[zoom] = cells
+        cells = cells.assign(row=cells['row'] // 2, col=cells['col'] // 2)
+    return grid
+
+
+def geo_grid_partitioned(points, workers=None):
+    """ geo_grid() calculada por país em paralelo (FOMEZERO_WORKERS).
+
+        As células de cada zoom ficam agrupadas por país, em outra ordem que
+        a da versão serial, com os mesmos valores.
+    """
+    parts = map_partitions(points.loc[:, GRID_COLUMNS], 'country', geo_grid, workers)
+    if not parts:
+        return geo_grid(points)
+    return {zoom: pd.concat([part[zoom] for part in parts], ignore_index=True) for zoom in parts[0]}
+
+
+def grid_cells(grid, zoom, countries):
+    """ Esta função retorna as células ocupadas da grade para os países selecionados
+
+        O preço médio só é calculado nas células com uma única moeda; nas
+        células com mais de uma, cost_mean e currency ficam vazios.
+
+        Input: grade (geo_grid), zoom do mapa, lista de países
+        Output: Dataframe com row, col, south, west, size, restaurants,
+                rating_mean, cost_mean e currency (uma linha por célula ocupada)
+    """
+    zoom = grid_zoom(zoom)
+    level = grid[zoom]
+    cells = (level.loc[level['country'].isin(countries)]
+                  .groupby(['row', 'col'], sort=False, as_index=False)
+                  .agg(restaurants=('restaurants', 'sum'), rating_sum=('rating_sum', 'sum'),
+                       cost_sum=('cost_sum', 'sum'), currencies=('currency', 'nunique'),
+                       currency=('currency', 'first')))
+
+    size = cell_size(zoom)
+    single = cells['currencies'] == 1
+    cells['south'] = cells['row'] * size - 90
+    cells['west'] = cells['col'] * size - 180
+    cells['size'] = size
+    cells['rating_mean'] = cells['rating_sum'] / cells['restaurants']
+    cells['cost_mean'] = (cells['cost_sum'] / cells['restaurants']).where(single)
+    cells['currency'] = cells['currency'].where(single)
+    return cells[['row', 'col', 'south', 'west', 'size', 'restaurants', 'rating_mean', 'cost_mean', 'currency']]
+
+
+@st.cache_resource(max_entries=1, show_spinner=False)
+def _cached_geo_grid(path, signature):
+    if WORKERS > 1:
+        return geo_grid_partitioned(load_map_points(path))
+    return geo_grid(load_map_points(path))
+
+
+def load_geo_grid(path=DATASET_PATH):
+    """ Retorna a grade de densidade dos restaurantes, calculada uma vez por versão do CSV.
+
+        Input: caminho do CSV
+        Output: dict zoom -> Dataframe
+    """
+    return _cached_geo_grid(path, file_signature(path))
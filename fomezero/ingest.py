@@ -0,0 +1,184 @@
+""" Ingestão em streaming do CSV, para exportações maiores que a memória
+
+    O CSV é lido em blocos; cada bloco passa pelas mesmas etapas de
+    clean_code() e as duplicadas são removidas também entre blocos, por meio
+    do hash de cada linha. Os blocos limpos são gravados direto no cache
+    colunar e alimentam o resumo por país.
+"""
+# Bibliotecas
+#============================================
+import logging
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from .aggregates import CountrySummaryAccumulator, write_country_summary
+from .cleaning import finish_rows, prepare_rows
+from .data_loader import (CSV_COLUMNS, DATASET_PATH, SCHEMA, columnar_cache_path, publish_columnar_cache, read_csv,
+                          read_csv_chunks)
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+# Nos blocos só entram os tipos numéricos: as categorias de cada bloco seriam
+# diferentes, então o texto é gravado como string e categorizado na leitura.
+STREAM_SCHEMA = {col: dtype for col, dtype in SCHEMA.items() if dtype != 'category'}
+
+# Quantas vezes o tamanho do bloco lido a limpeza chega a ocupar (cópias
+# intermediárias de dropna, split, strip, etc.)
+CLEANING_OVERHEAD = 4
+
+
+# 1. Memória
+#============================================
+
+def peak_rss_mb():
+    """ Pico de memória residente do processo, em MB. """
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux informa em KB, macOS em bytes
+        return peak / 1e6 if sys.platform == 'darwin' else peak / 1024
+
+    import psutil
+    return psutil.Process().memory_info().peak_wset / 1e6
+
+
+def chunk_rows_for_budget(path, memory_mb, sample_rows=1000):
+    """ Calcula quantas linhas por bloco cabem no orçamento de memória.
+
+        O tamanho médio de uma linha é estimado a partir das primeiras
+        sample_rows linhas do arquivo.
+    """
+    sample = read_csv(path, engine='c', nrows=sample_rows)
+    row_bytes = sample.memory_usage(deep=True).sum() / max(len(sample), 1)
+    return max(1000, int(memory_mb * 1e6 / (row_bytes * CLEANING_OVERHEAD)))
+
+
+# 2. Remoção de duplicadas entre blocos
+#============================================
+
+class SeenHashes:
+    """ Conjunto de hashes de 64 bits guardado em blocos numpy ordenados
+
+        Usa 8 bytes por linha distinta (um set do Python usaria ~10x mais);
+        essa memória fica fora do orçamento de cada bloco.
+        Os blocos são fundidos como em um contador binário, então sempre há
+        no máximo log2(n) blocos para consultar.
+    """
+
+    def __init__(self):
+        self._blocks = []
+
+    def __len__(self):
+        return sum(len(block) for block in self._blocks)
+
+    @property
+    def nbytes(self):
+        return sum(block.nbytes for block in self._blocks)
+
+    def contains(self, hashes):
+        found = np.zeros(len(hashes), dtype=bool)
+        for block in self._blocks:
+            pos = np.searchsorted(block, hashes)
+            pos[pos == len(block)] = 0
+            found |= block[pos] == hashes
+        return found
+
+    def add(self, hashes):
+        block = np.unique(hashes)
+        if not len(block):
+            return
+        while self._blocks and len(self._blocks[-1]) <= len(block):
+            block = np.union1d(self._blocks.pop(), block)
+        self._blocks.append(block)
+
+
+# 3. Limpeza em blocos
+#============================================
+
+def stream_clean_csv(path=DATASET_PATH, chunk_rows=100_000, seen=None):
+    """ Esta função lê e limpa o CSV bloco a bloco
+
+        O resultado concatenado é igual ao de clean_code() no arquivo inteiro:
+        as duplicadas são removidas dentro de cada bloco e depois comparadas
+        com o hash (restaurant_id e demais colunas) das linhas já vistas.
+
+        Input: caminho do CSV, linhas por bloco, SeenHashes (opcional, para
+               consultar a memória usada pelos hashes)
+        Output: gerador de (Dataframe limpo, linhas lidas)
+    """
+    seen = SeenHashes() if seen is None else seen
+    for chunk in read_csv_chunks(path, chunk_rows):
+        # Sem os vazios, os inteiros anuláveis voltam aos tipos declarados
+        rows = prepare_rows(chunk.dropna().astype(CSV_COLUMNS)).drop_duplicates()
+        hashes = pd.util.hash_pandas_object(rows, index=False).to_numpy()
+        new = ~seen.contains(hashes)
+        seen.add(hashes[new])
+        yield finish_rows(rows.loc[new]), len(chunk)
+
+
+def build_columnar_cache_streaming(path=DATASET_PATH, memory_mb=512):
+    """ Etapa de build em streaming: CSV -> cache colunar, bloco a bloco
+
+        O resumo por país acumulado nos blocos é gravado ao lado do cache
+        colunar (aggregates.write_country_summary).
+
+        Input: caminho do CSV, orçamento de memória (MB) para cada bloco
+        Output: dict com o relatório da ingestão (linhas, duplicadas, pico de
+                memória, memória dos hashes fora do orçamento e caminhos do
+                cache e do resumo por país)
+    """
+    chunk_rows = chunk_rows_for_budget(path, memory_mb)
+    cache_path = columnar_cache_path(path)
+    tmp_path = f'{cache_path}.{os.getpid()}.tmp'
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+
+    summary = CountrySummaryAccumulator()
+    seen = SeenHashes()
+    report = {'chunks': 0, 'rows_read': 0, 'rows_written': 0}
+    schema = None
+    writer = None
+    try:
+        for rows, rows_read in stream_clean_csv(path, chunk_rows, seen):
+            report['chunks'] += 1
+            report['rows_read'] += rows_read
+            if rows.empty:
+                continue
+            rows = rows.astype(STREAM_SCHEMA)
+            summary.add(rows)
+
+            table = pa.Table.from_pandas(rows, schema=schema, preserve_index=True)
+            if writer is None:
+                schema = table.schema
+                writer = pa.ipc.new_file(tmp_path, schema)
+            writer.write_table(table)
+            report['rows_written'] += len(rows)
+    finally:
+        if writer is not None:
+            writer.close()
+
+    if writer is None:
+        raise ValueError(f'Nenhuma linha válida em {path}')
+    publish_columnar_cache(tmp_path, cache_path)
+    summary_path = write_country_summary(summary.result(), cache_path)
+
+    report.update({
+        'duplicates_or_nan': report['rows_read'] - report['rows_written'],
+        'chunk_rows': chunk_rows,
+        'memory_budget_mb': memory_mb,
+        'peak_rss_mb': round(peak_rss_mb(), 1),
+        'seen_hashes_mb': round(seen.nbytes / 1e6, 1),
+        'cache_path': cache_path,
+        'summary_path': summary_path,
+    })
+    logger.info('Ingestão em streaming: %d linhas lidas, %d gravadas, %d blocos de %d linhas, pico de %.1f MB '
+                '(%.1f MB de hashes fora do orçamento)', report['rows_read'], report['rows_written'], report['chunks'],
+                chunk_rows, report['peak_rss_mb'], report['seen_hashes_mb'])
+    return report
@@ -0,0 +1,40 @@
+""" Importação preguiçosa dos módulos pesados das páginas
+
+    lazy_import('plotly.express') devolve um objeto que só importa o módulo
+    no primeiro acesso a um atributo (px.bar, por exemplo). Uma página cujo
+    gráfico veio do cache de figuras, ou um mapa que já está em cache, nunca
+    paga o custo desses imports.
+
+    FOMEZERO_LAZY_IMPORTS=0 volta a importar tudo na carga da página (útil
+    para comparar com benchmarks/import_report.py).
+"""
+# Bibliotecas
+#============================================
+import importlib
+import os
+
+LAZY_IMPORTS = os.environ.get('FOMEZERO_LAZY_IMPORTS', '1') != '0'
+
+
+class LazyModule:
+    """ Substituto de um módulo que o importa no primeiro acesso a atributo. """
+
+    def __init__(self, name):
+        self._name = name
+
+    def __getattr__(self, attr):
+        return getattr(importlib.import_module(self._name), attr)
+
+    def __repr__(self):
+        return f'<LazyModule {self._name!r}>'
+
+
+def lazy_import(name):
+    """ Esta função retorna o módulo `name`, importado só quando for usado
+
+        Input: nome completo do módulo
+        Output: LazyModule (ou o próprio módulo com FOMEZERO_LAZY_IMPORTS=0)
+    """
+    if LAZY_IMPORTS:
+        return LazyModule(name)
+    return importlib.import_module(name)
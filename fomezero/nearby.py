@@ -0,0 +1,256 @@
+""" Restaurantes próximos a um ponto (k mais próximos ou dentro de um raio)
+
+    Os restaurantes (um por restaurant_id) ficam em uma KD-tree (scipy
+    cKDTree) montada uma vez sobre os vetores unitários 3D de latitude /
+    longitude. A distância em linha reta entre dois pontos da esfera (corda)
+    cresce junto com a distância haversine, então os k mais próximos pela
+    corda são os k mais próximos pela haversine e um raio em km vira um raio
+    de corda. A consulta visita só alguns nós da árvore, sem percorrer a base.
+
+    As distâncias devolvidas são calculadas pela biblioteca haversine.
+"""
+# Bibliotecas
+#============================================
+import math
+
+import numpy as np
+import streamlit as st
+from haversine import haversine_vector
+
+from .data_loader import DATASET_PATH, file_signature, load_dataset
+from .lazy import lazy_import
+from .rankings import first_k
+
+# Só importado pelas páginas que montam o índice
+spatial = lazy_import('scipy.spatial')
+
+# Raio médio da Terra usado pela biblioteca haversine
+EARTH_RADIUS_KM = 6371.0088
+
+NEARBY_COLUMNS = [
+    'restaurant_id',
+    'restaurant_name',
+    'country',
+    'city',
+    'cuisines',
+    'aggregate_rating',
+    'average_cost_for_two',
+    'currency',
+    'latitude',
+    'longitude',
+]
+
+
+# 1. Geometria
+#============================================
+
+def unit_vectors(latitude, longitude):
+    """ Esta função converte latitude / longitude (graus) em vetores unitários 3D
+
+        Input: arrays de latitude e longitude
+        Output: array (n, 3)
+    """
+    lat = np.radians(np.asarray(latitude, dtype=np.float64))
+    lon = np.radians(np.asarray(longitude, dtype=np.float64))
+    cos_lat = np.cos(lat)
+    return np.column_stack([cos_lat * np.cos(lon), cos_lat * np.sin(lon), np.sin(lat)])
+
+
+def chord_length(km):
+    """ Corda (na esfera unitária) equivalente a uma distância sobre a superfície. """
+    return 2 * math.sin(min(km / EARTH_RADIUS_KM, math.pi) / 2)
+
+
+# 2. Índice espacial
+#============================================
+
+class NearbyIndex:
+    """ KD-tree dos restaurantes para consultas por proximidade.
+
+        Cada culinária ganha a sua própria KD-tree na primeira consulta que
+        a filtra; a nota mínima é conferida só nos vizinhos encontrados.
+
+        Input: Dataframe limpo (completo)
+    """
+
+    def __init__(self, dataframe):
+        points = (dataframe.loc[:, NEARBY_COLUMNS]
+                           .drop_duplicates('restaurant_id')
+                           .reset_index(drop=True))
+        self.points = points
+        self.coordinates = np.column_stack([points['latitude'].to_numpy(np.float64),
+                                            points['longitude'].to_numpy(np.float64)])
+        self.vectors = unit_vectors(self.coordinates[:, 0], self.coordinates[:, 1])
+        self.tree = spatial.cKDTree(self.vectors)
+
+        cuisines = points['cuisines'].astype('category')
+        self.cuisine_names = cuisines.cat.categories
+        self.cuisine_codes = cuisines.cat.codes.to_numpy()
+        self.cuisine_rows = np.argsort(self.cuisine_codes, kind='stable')
+        self.cuisine_bounds = np.searchsorted(self.cuisine_codes[self.cuisine_rows],
+                                              np.arange(len(self.cuisine_names) + 1))
+        self.cuisine_trees = {}
+
+        self.ratings = points['aggregate_rating'].to_numpy()
+        self.rating_rows = np.argsort(self.ratings, kind='stable')
+        self.sorted_ratings = self.ratings[self.rating_rows]
+
+    def __len__(self):
+        return len(self.points)
+
+    def nearest(self, latitude, longitude, k=10, cuisines=None, min_rating=None):
+        """ Esta função retorna os k restaurantes mais próximos do ponto
+
+            Input: latitude, longitude, quantidade, culinárias aceitas,
+                   nota mínima
+            Output: Dataframe com NEARBY_COLUMNS + distance_km, do mais
+                    próximo para o mais distante
+        """
+        return self.rows(*self.nearest_positions(latitude, longitude, k, cuisines, min_rating))
+
+    def within(self, latitude, longitude, radius_km, cuisines=None, min_rating=None):
+        """ Esta função retorna todos os restaurantes a até radius_km do ponto
+
+            Input: latitude, longitude, raio em km, culinárias aceitas,
+                   nota mínima
+            Output: Dataframe com NEARBY_COLUMNS + distance_km, do mais
+                    próximo para o mais distante
+        """
+        return self.rows(*self.within_positions(latitude, longitude, radius_km, cuisines, min_rating))
+
+    def nearest_positions(self, latitude, longitude, k=10, cuisines=None, min_rating=None):
+        """ Esta função encontra as posições dos k restaurantes mais próximos
+
+            Com filtro de culinária a consulta vai às árvores das culinárias
+            pedidas. Com nota mínima a árvore é consultada com folga
+            proporcional à fração de restaurantes com essa nota, e a folga
+            cresce até achar k.
+
+            Input: latitude, longitude, quantidade, culinárias aceitas,
+                   nota mínima
+            Output: posições em self.points e distâncias em km
+        """
+        point = unit_vectors([latitude], [longitude])[0]
+        codes = self._codes(cuisines)
+        if codes is None and min_rating is None:
+            positions = self._query(self.tree, point, k)
+        else:
+            positions = self._filtered_query(point, k, codes, min_rating)
+        return positions, self._distances(positions, latitude, longitude)
+
+    def within_positions(self, latitude, longitude, radius_km, cuisines=None, min_rating=None):
+        """ Esta função encontra as posições dos restaurantes a até radius_km
+
+            Input: latitude, longitude, raio em km, culinárias aceitas,
+                   nota mínima
+            Output: posições em self.points e distâncias em km, da mais
+                    próxima para a mais distante
+        """
+        point = unit_vectors([latitude], [longitude])[0]
+        positions = np.asarray(self.tree.query_ball_point(point, chord_length(radius_km)), dtype=np.intp)
+        positions = self._by_distance(point, positions[self._passes(positions, self._codes(cuisines), min_rating)])
+        return positions, self._distances(positions, latitude, longitude)
+
+    def rows(self, positions, distances):
+        """ Esta função monta o Dataframe de um resultado
+
+            Input: posições e distâncias (nearest_positions / within_positions)
+            Output: Dataframe com NEARBY_COLUMNS + distance_km
+        """
+        result = self.points.take(positions).reset_index(drop=True)
+        result['distance_km'] = distances
+        return result
+
+    # Filtros
+    def _codes(self, cuisines):
+        if not cuisines:
+            return None
+        codes = self.cuisine_names.get_indexer(list(cuisines))
+        return np.unique(codes[codes >= 0])
+
+    def _passes(self, positions, codes, min_rating):
+        passes = np.ones(len(positions), dtype=bool)
+        if codes is not None:
+            passes &= np.isin(self.cuisine_codes[positions], codes)
+        if min_rating is not None:
+            passes &= self.ratings[positions] >= min_rating
+        return passes
+
+    def _rating_positions(self, min_rating):
+        return self.rating_rows[np.searchsorted(self.sorted_ratings, min_rating):]
+
+    def _cuisine_tree(self, code):
+        """ KD-tree e posições dos restaurantes de uma culinária (montada na primeira consulta). """
+        if code not in self.cuisine_trees:
+            rows = self.cuisine_rows[self.cuisine_bounds[code]:self.cuisine_bounds[code + 1]]
+            self.cuisine_trees[code] = (spatial.cKDTree(self.vectors[rows]), rows)
+        return self.cuisine_trees[code]
+
+    # Consultas
+    def _query(self, tree, point, k):
+        if k <= 0 or not tree.n:
+            return np.empty(0, dtype=np.intp)
+        _, found = tree.query(point, k=min(k, tree.n))
+        return np.atleast_1d(found).astype(np.intp)
+
+    def _filtered_query(self, point, k, codes, min_rating):
+        if codes is None:
+            return self._search(self.tree, None, point, k, min_rating)
+
+        # Os k mais próximos de cada culinária pedida, depois os k mais próximos entre eles
+        found = [self._search(*self._cuisine_tree(code), point, k, min_rating) for code in codes]
+        found = np.concatenate(found or [np.empty(0, dtype=np.intp)])
+        return found[first_k(self._chords(point, found), k)]
+
+    def _search(self, tree, rows, point, k, min_rating):
+        """ k mais próximos com nota mínima em uma árvore (rows: posição de cada ponto; None = todos). """
+        def positions(found):
+            return found if rows is None else rows[found]
+
+        if min_rating is None:
+            return positions(self._query(tree, point, k))
+
+        # Vizinhos suficientes para que ~2k passem na nota. Quando seria
+        # preciso pedir mais de 1/8 dos restaurantes com a nota, é mais barato
+        # calcular a distância direto neles.
+        rated = len(self) - int(np.searchsorted(self.sorted_ratings, min_rating))
+        share = max(rated, 1) / max(len(self), 1)
+        wanted = math.ceil(2 * k / share)
+        while wanted < tree.n and wanted * 8 <= tree.n * share:
+            found = positions(self._query(tree, point, wanted))
+            found = found[self.ratings[found] >= min_rating]
+            if len(found) >= k:
+                return found[:k]
+            wanted *= 4
+
+        if rows is None:
+            candidates = self._rating_positions(min_rating)
+        else:
+            candidates = rows[self.ratings[rows] >= min_rating]
+        return candidates[first_k(self._chords(point, candidates), k)]
+
+    def _chords(self, point, positions):
+        # A ordem pela corda é a mesma da distância haversine
+        return np.linalg.norm(self.vectors[positions] - point, axis=1)
+
+    def _by_distance(self, point, positions):
+        return positions[np.lexsort((positions, self._chords(point, positions)))]
+
+    def _distances(self, positions, latitude, longitude):
+        if not len(positions):
+            return np.empty(0)
+        return haversine_vector(self.coordinates[positions], [latitude, longitude], comb=True)[0]
+
+
+@st.cache_resource(max_entries=1, show_spinner=False)
+def _cached_nearby_index(path, signature):
+    return NearbyIndex(load_dataset(path))
+
+
+def load_nearby_index(path=DATASET_PATH):
+    """ Retorna o índice espacial dos restaurantes, montado uma vez por versão do CSV.
+
+        Input: caminho do CSV
+        Output: NearbyIndex
+    """
+    return _cached_nearby_index(path, file_signature(path))
@@ -0,0 +1,46 @@
+""" Execução em paralelo por partição (um processo por grupo de países)
+
+    FOMEZERO_WORKERS controla o número de processos: 1 (padrão) mantém tudo
+    serial, "auto" usa todos os núcleos da máquina.
+
+    Particionados por país: a limpeza do CSV, o resumo por país, os conjuntos
+    distintos por país, as somas por culinária e a grade do mapa. Os rankings
+    das páginas continuam seriais, porque os conjuntos das cidades
+    compartilhadas entre países dependem de um dicionário de valores da base
+    inteira.
+"""
+# Bibliotecas
+#============================================
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+
+def _parse_workers(value):
+    if value == 'auto':
+        return os.cpu_count() or 1
+    return max(1, int(value))
+
+
+WORKERS = _parse_workers(os.environ.get('FOMEZERO_WORKERS', '1'))
+
+
+# 1. Partições
+#============================================
+
+def map_partitions(dataframe, by, fn, workers=None):
+    """ Esta função aplica fn a cada partição do dataframe em um pool de processos
+
+        Cada partição reúne as linhas de um valor de `by` (linhas com `by`
+        vazio ficam de fora). fn precisa ser uma função de módulo, para poder
+        ser enviada aos processos.
+
+        Input: Dataframe, coluna de partição, função, número de processos
+        Output: lista com o resultado de fn para cada partição
+    """
+    workers = WORKERS if workers is None else workers
+    parts = [part for _, part in dataframe.groupby(by, observed=True, sort=False)]
+    if workers <= 1 or len(parts) <= 1:
+        return [fn(part) for part in parts]
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(parts))) as pool:
+        return list(pool.map(fn, parts))
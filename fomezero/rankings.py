@@ -0,0 +1,254 @@
+""" Rankings top-K / bottom-K das páginas de cidades e culinárias
+
+    Cada ranking guarda, por país, os valores parciais de cada grupo
+    (cidade, culinária ou restaurante). Uma consulta para uma seleção de
+    países não ordena a base: grupos que pertencem a um só país vêm de
+    listas já ordenadas combinadas com heap; grupos compartilhados entre
+    países são somados e passam por seleção parcial. Contagens de valores
+    distintos de grupos compartilhados (ex.: uma cidade com o mesmo nome em
+    dois países) são recombinadas pela união dos conjuntos de cada país.
+
+    Empates são desfeitos pela ordem dos grupos (a mesma do groupby),
+    como em nlargest/nsmallest com keep='first'.
+"""
+# Bibliotecas
+#============================================
+import heapq
+from itertools import islice
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from .data_loader import DATASET_PATH, file_signature, load_dataset
+
+
+# 1. Ranking
+#============================================
+
+def first_k(primary, k):
+    """ Esta função seleciona as posições dos k menores valores de um array
+
+        Seleção parcial (np.partition), com empates desfeitos pela posição.
+
+        Input: array numérico, quantidade
+        Output: array com as k posições, do menor valor para o maior
+    """
+    if len(primary) > k:
+        kth = np.partition(primary, k - 1)[k - 1]
+        candidates = np.flatnonzero(primary <= kth)
+    else:
+        candidates = np.arange(len(primary))
+    order = np.lexsort((candidates, primary[candidates]))
+    return candidates[order[:k]]
+
+
+def select_top(values, k, largest=True):
+    """ Esta função seleciona os k maiores (ou menores) valores de uma Series
+
+        Seleção parcial, com empates desfeitos pela ordem da Series.
+
+        Input: Series, quantidade, largest
+        Output: Series com os k valores, em ordem
+    """
+    array = values.to_numpy(dtype=float)
+    return values.iloc[first_k(-array if largest else array, k)]
+
+
+class Ranking:
+    """ Valores parciais por (país, grupo) prontos para consultas top-K.
+
+        Input: Series indexada pelo grupo com o total de cada (país, grupo),
+               país de cada linha, para médias as contagens alinhadas e, para
+               valores distintos, os conjuntos das linhas de grupos
+               compartilhados (group_sets)
+    """
+
+    def __init__(self, total, country, count=None, sets=None):
+        keys = total.index
+        self.groups = keys.unique().sort_values()
+        self.mean = count is not None
+        # cada grupo em um só país -> listas ordenadas por país + heap merge
+        self.local = not keys.duplicated().any()
+
+        codes = self.groups.get_indexer(keys)
+        totals = total.to_numpy()
+        counts = count.to_numpy() if self.mean else np.ones(len(total), dtype=np.int64)
+
+        # Grupos compartilhados: o total é a quantidade de bits da união
+        self.shared = None
+        if sets is not None and not self.local:
+            shared = keys.duplicated(keep=False)
+            self.shared, slots = np.unique(codes[shared], return_inverse=True)
+            set_rows = np.full(len(total), -1)
+            set_rows[shared] = np.arange(shared.sum())
+
+        self.partials = {}
+        for name, rows in pd.Series(np.arange(len(total))).groupby(country, observed=True):
+            rows = rows.to_numpy()
+            part = {'codes': codes[rows], 'total': totals[rows], 'count': counts[rows]}
+            if self.shared is not None:
+                rows = set_rows[rows]
+                rows = rows[rows >= 0]
+                part['slots'], part['sets'] = slots[rows], sets[rows]
+            if self.local:
+                values = self._values(part['total'], part['count'])
+                asc = np.lexsort((part['codes'], values))
+                desc = np.lexsort((part['codes'], -values))
+                part['asc'] = (values[asc], part['codes'][asc])
+                part['desc'] = (values[desc], part['codes'][desc])
+            self.partials[name] = part
+
+    def _values(self, total, count):
+        return total / count if self.mean else total
+
+    def top(self, countries, k):
+        """ Esta função retorna os k grupos de maior valor nos países selecionados
+
+            Input: lista de países, quantidade de grupos
+            Output: Dataframe com as colunas do grupo e 'value'
+        """
+        return self._query(countries, k, largest=True)
+
+    def bottom(self, countries, k):
+        """ Esta função retorna os k grupos de menor valor nos países selecionados
+
+            Input: lista de países, quantidade de grupos
+            Output: Dataframe com as colunas do grupo e 'value'
+        """
+        return self._query(countries, k, largest=False)
+
+    def _query(self, countries, k, largest):
+        parts = [self.partials[name] for name in dict.fromkeys(countries) if name in self.partials]
+        if self.local:
+            codes, values = self._merge(parts, k, largest)
+        else:
+            codes, values = self._select(parts, k, largest)
+
+        result = self.groups[codes].to_frame(index=False)
+        result['value'] = values
+        return result
+
+    def _merge(self, parts, k, largest):
+        key = 'desc' if largest else 'asc'
+        sign = -1 if largest else 1
+        runs = [zip((sign * p[key][0][:k]).tolist(), p[key][1][:k].tolist()) for p in parts]
+        best = list(islice(heapq.merge(*runs), k))
+        codes = np.array([code for _, code in best], dtype=np.intp)
+        values = np.array([sign * value for value, _ in best], dtype=self._dtype(parts))
+        return codes, values
+
+    def _select(self, parts, k, largest):
+        total = np.zeros(len(self.groups))
+        count = np.zeros(len(self.groups), dtype=np.int64)
+        for part in parts:
+            np.add.at(total, part['codes'], part['total'])
+            np.add.at(count, part['codes'], part['count'])
+        if self.shared is not None:
+            union = np.zeros((len(self.shared), parts[0]['sets'].shape[1] if parts else 0), dtype=np.uint8)
+            for part in parts:
+                np.bitwise_or.at(union, part['slots'], part['sets'])
+            total[self.shared] = np.unpackbits(union, axis=1).sum(axis=1)
+
+        present = np.flatnonzero(count > 0)
+        values = self._values(total[present], count[present])
+        chosen = first_k(-values if largest else values, k)
+        return present[chosen], values[chosen].astype(self._dtype(parts))
+
+    def _dtype(self, parts):
+        if self.mean or not parts:
+            return np.float64
+        return parts[0]['total'].dtype
+
+
+def group_sets(dataframe, grouped, rows, value):
+    """ Esta função monta o conjunto de valores de algumas linhas de um groupby
+
+        Cada conjunto é uma linha de bits (um bit por valor distinto da coluna),
+        como em aggregates.country_distinct_sets.
+
+        Input: Dataframe, groupby sobre ele, máscara das linhas do resultado
+               do groupby, coluna de valor
+        Output: matriz uint8 (linhas selecionadas x bits empacotados)
+    """
+    group_rows = np.full(len(rows), -1)
+    group_rows[rows] = np.arange(rows.sum())
+    group_rows = group_rows[grouped.ngroup().to_numpy()]
+    codes, uniques = pd.factorize(dataframe[value])
+
+    keep = group_rows >= 0
+    present = np.zeros((rows.sum(), len(uniques)), dtype=bool)
+    present[group_rows[keep], codes[keep]] = True
+    return np.packbits(present, axis=1)
+
+
+def build_ranking(dataframe, group, value=None, how='count'):
+    """ Esta função monta o Ranking de um grupo de colunas
+
+        Input: Dataframe limpo, colunas do grupo, coluna de valor e
+               how = 'count' (linhas), 'mean' (média de value) ou
+               'nunique' (valores distintos de value)
+        Output: Ranking
+    """
+    keys = list(group) if 'country' in group else ['country'] + list(group)
+    grouped = dataframe.groupby(keys, observed=True)
+
+    if how == 'count':
+        total, count = grouped.size(), None
+    elif how == 'mean':
+        total, count = grouped[value].sum(), grouped[value].count()
+    elif how == 'nunique':
+        total, count = grouped[value].nunique(), None
+    else:
+        raise ValueError(f'Agregação desconhecida: {how!r}')
+
+    country = total.index.get_level_values('country')
+    if 'country' not in group:
+        total = total.droplevel('country')
+        count = None if count is None else count.droplevel('country')
+
+    # Valores distintos não podem ser somados entre países: os grupos
+    # compartilhados guardam o conjunto de valores de cada país
+    sets = None
+    shared = total.index.duplicated(keep=False)
+    if how == 'nunique' and shared.any():
+        sets = group_sets(dataframe, grouped, shared, value)
+
+    return Ranking(total, country, count, sets)
+
+
+# 2. Rankings das páginas
+#============================================
+
+RESTAURANT_COLUMNS = ['restaurant_id', 'restaurant_name', 'country', 'city', 'cuisines',
+                      'currency', 'average_cost_for_two', 'votes']
+
+
+def page_rankings(dataframe):
+    """ Esta função monta todos os rankings usados nas páginas
+
+        Input: Dataframe limpo (completo)
+        Output: dict nome -> Ranking
+    """
+    rating = dataframe['aggregate_rating']
+    return {
+        'city_restaurants': build_ranking(dataframe, ['city', 'country']),
+        'city_rating_above_4': build_ranking(dataframe[rating > 4], ['city'], 'aggregate_rating', 'mean'),
+        'city_rating_below_2_5': build_ranking(dataframe[rating < 2.5], ['city'], 'aggregate_rating', 'mean'),
+        'city_cuisines': build_ranking(dataframe, ['city'], 'cuisines', 'nunique'),
+        'restaurant_rating': build_ranking(dataframe, RESTAURANT_COLUMNS, 'aggregate_rating', 'mean'),
+    }
+
+
+@st.cache_resource(max_entries=1, show_spinner=False)
+def _cached_rankings(path, signature):
+    return page_rankings(load_dataset(path))
+
+
+def load_rankings(path=DATASET_PATH):
+    """ Retorna os rankings das páginas, montados uma vez por versão do CSV.
+
+        Input: caminho do CSV
+        Output: dict nome -> Ranking
+    """
+    return _cached_rankings(path, file_signature(path))
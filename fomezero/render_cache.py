@@ -0,0 +1,59 @@
+# Bibliotecas
+#============================================
+import threading
+from collections import OrderedDict
+
+
+# 1. Cache LRU compartilhado entre sessões
+#============================================
+
+class LRUCache:
+    """ Cache LRU limitado por número de entradas e por tamanho total em bytes
+
+        Pensado para guardar artefatos já renderizados (HTML, JSON) em um
+        objeto único por processo, acessado por várias sessões ao mesmo tempo.
+        Entradas maiores que max_bytes não são guardadas.
+    """
+
+    def __init__(self, max_entries=32, max_bytes=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._nbytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return self._entries[key][0]
+
+    def put(self, key, value, nbytes=None):
+        if nbytes is None:
+            nbytes = len(value)
+        if self.max_bytes is not None and nbytes > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._nbytes -= self._entries.pop(key)[1]
+            self._entries[key] = (value, nbytes)
+            self._nbytes += nbytes
+
+            # Removendo as entradas usadas há mais tempo
+            while len(self._entries) > self.max_entries or (
+                    self.max_bytes is not None and self._nbytes > self.max_bytes):
+                self._nbytes -= self._entries.popitem(last=False)[1][1]
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self._nbytes,
+                'hits': self.hits,
+                'misses': self.misses,
+            }
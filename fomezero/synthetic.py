@@ -0,0 +1,178 @@
+""" Gerador de bases sintéticas no formato do CSV do Zomato
+
+    Cada linha parte de um restaurante real do CSV do projeto (o que mantém
+    a distribuição de países, cidades, moedas, preços, notas e votos) e
+    recebe um novo Restaurant ID, coordenadas deslocadas, nota e votos
+    perturbados e uma nova lista de culinárias. Cor e texto da avaliação são
+    recalculados a partir da nota. Duplicadas exatas e Cuisines vazias são
+    inseridas nas taxas pedidas.
+
+    A base é gravada em blocos (CSV ou Parquet, pela extensão do arquivo),
+    sem nunca ficar inteira na memória. A mesma semente e o mesmo tamanho de
+    bloco geram sempre o mesmo arquivo.
+
+    Uso (na raiz do projeto):
+        python -m fomezero.synthetic saida.csv --rows 1000000 [--seed 0]
+        python -m fomezero.synthetic saida.parquet --rows 1000000 --duplicate-rate 0.1 --nan-rate 0.01
+"""
+# Bibliotecas
+#============================================
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from .cleaning import COLORS, COUNTRIES
+from .data_loader import CSV_COLUMNS, DATASET_PATH
+
+# Ordem das colunas do CSV original (inclui a coluna que a leitura descarta)
+RAW_COLUMNS = list(CSV_COLUMNS)
+RAW_COLUMNS.insert(RAW_COLUMNS.index('Is delivering now') + 1, 'Switch to order menu')
+
+# Faixas de nota do Zomato: (nota mínima, cor, texto)
+RATING_BANDS = [
+    (0.0, 'CBCBC8', 'Not rated'),
+    (1.8, 'FF7800', 'Poor'),
+    (2.5, 'FFBA00', 'Average'),
+    (3.0, 'CDD614', 'Average'),
+    (3.5, '9ACD32', 'Good'),
+    (4.0, '5BA829', 'Very Good'),
+    (4.5, '3F7E00', 'Excellent'),
+]
+
+# Taxas do CSV do projeto: ~7.8% de linhas duplicadas e ~0.2% sem Cuisines
+DUPLICATE_RATE = 0.078
+NAN_RATE = 0.002
+
+
+# 1. Perfil da base real
+#============================================
+
+class DatasetProfile:
+    """ Restaurantes de referência e vocabulário de culinárias do CSV do projeto.
+
+        Input: caminho do CSV usado como modelo
+    """
+
+    def __init__(self, path=DATASET_PATH):
+        base = pd.read_csv(path).dropna().drop_duplicates()
+        base = base[base['Country Code'].isin(COUNTRIES) & base['Rating color'].isin(COLORS)]
+        self.templates = base.reset_index(drop=True)
+
+        cuisines = base['Cuisines'].str.split(',').explode().str.strip()
+        vocabulary = cuisines.value_counts()
+        self.cuisines = vocabulary.index.to_numpy()
+        self.cuisine_weights = (vocabulary / vocabulary.sum()).to_numpy()
+
+        per_row = base['Cuisines'].str.count(',').add(1).value_counts().sort_index()
+        self.cuisine_counts = per_row.index.to_numpy()
+        self.cuisine_count_weights = (per_row / per_row.sum()).to_numpy()
+
+
+# 2. Geração em blocos
+#============================================
+
+def _cuisine_lists(profile, rng, rows):
+    counts = rng.choice(profile.cuisine_counts, rows, p=profile.cuisine_count_weights)
+    picks = rng.choice(len(profile.cuisines), (rows, counts.max()), p=profile.cuisine_weights)
+    names = profile.cuisines[picks]
+    return np.array([', '.join(dict.fromkeys(row[:count])) for row, count in zip(names, counts)], dtype=object)
+
+
+def _rating_columns(rating):
+    bounds = np.array([band[0] for band in RATING_BANDS])
+    band = np.searchsorted(bounds, rating, side='right') - 1
+    band[rating == 0] = 0
+    colors = np.array([band[1] for band in RATING_BANDS], dtype=object)
+    texts = np.array([band[2] for band in RATING_BANDS], dtype=object)
+    return colors[band], texts[band]
+
+
+def _mark_duplicates(chunk, rng, rate):
+    """ Copia linhas anteriores do bloco para as posições sorteadas como duplicadas. """
+    duplicate = rng.random(len(chunk)) < rate
+    duplicate[0] = False
+    originals = np.flatnonzero(~duplicate)
+    targets = np.flatnonzero(duplicate)
+    available = np.searchsorted(originals, targets)
+    rows = np.arange(len(chunk))
+    rows[targets] = originals[(rng.random(len(targets)) * available).astype(np.int64)]
+    return chunk.take(rows).reset_index(drop=True)
+
+
+def synthetic_chunk(profile, rng, first_id, rows, duplicate_rate=DUPLICATE_RATE, nan_rate=NAN_RATE):
+    """ Esta função gera um bloco de linhas no formato do CSV original
+
+        Input: DatasetProfile, gerador numpy, primeiro Restaurant ID, linhas,
+               taxa de duplicadas, taxa de Cuisines vazias
+        Output: Dataframe com RAW_COLUMNS
+    """
+    chunk = profile.templates.iloc[rng.integers(0, len(profile.templates), rows)].reset_index(drop=True)
+    chunk['Restaurant ID'] = np.arange(first_id, first_id + rows, dtype=np.int64)
+    chunk['Longitude'] = (chunk['Longitude'] + rng.normal(0, 0.01, rows)).round(10)
+    chunk['Latitude'] = (chunk['Latitude'] + rng.normal(0, 0.01, rows)).round(10)
+    chunk['Cuisines'] = _cuisine_lists(profile, rng, rows)
+
+    rated = chunk['Aggregate rating'].to_numpy() > 0
+    rating = chunk['Aggregate rating'].to_numpy() + rng.choice([-0.1, 0.0, 0.1], rows)
+    chunk['Aggregate rating'] = np.where(rated, np.clip(rating, 1.8, 4.9), 0.0).round(1)
+    chunk['Rating color'], chunk['Rating text'] = _rating_columns(chunk['Aggregate rating'].to_numpy())
+    chunk['Votes'] = (chunk['Votes'] * rng.lognormal(0, 0.3, rows)).round().astype(np.int64)
+
+    chunk = _mark_duplicates(chunk[RAW_COLUMNS], rng, duplicate_rate)
+    chunk.loc[rng.random(rows) < nan_rate, 'Cuisines'] = np.nan
+    return chunk
+
+
+def _arrow_schema():
+    types = {'int64': pa.int64(), 'int16': pa.int64(), 'int8': pa.int64(), 'float64': pa.float64(), 'object': pa.string()}
+    dtypes = dict(CSV_COLUMNS, **{'Switch to order menu': 'int8'})
+    return pa.schema([(col, types[dtypes[col]]) for col in RAW_COLUMNS])
+
+
+def generate(path, rows, seed=0, chunk_rows=100_000, duplicate_rate=DUPLICATE_RATE, nan_rate=NAN_RATE,
+             profile_path=DATASET_PATH):
+    """ Esta função grava uma base sintética com `rows` linhas, bloco a bloco
+
+        O formato vem da extensão: .parquet gera Parquet, o resto gera CSV.
+
+        Input: caminho de saída, linhas, semente, linhas por bloco, taxa de
+               duplicadas, taxa de Cuisines vazias, CSV usado como modelo
+        Output: caminho gravado
+    """
+    if rows >= np.iinfo(np.int32).max:
+        raise ValueError('restaurant_id precisa caber em int32')
+
+    profile = DatasetProfile(profile_path)
+    rng = np.random.default_rng(seed)
+    parquet = path.endswith('.parquet')
+    tmp = path + '.tmp'
+
+    writer = pq.ParquetWriter(tmp, _arrow_schema()) if parquet else open(tmp, 'w', encoding='utf-8', newline='')
+    try:
+        for start in range(0, rows, chunk_rows):
+            chunk = synthetic_chunk(profile, rng, start + 1, min(chunk_rows, rows - start), duplicate_rate, nan_rate)
+            if parquet:
+                writer.write_table(pa.Table.from_pandas(chunk, schema=writer.schema, preserve_index=False))
+            else:
+                chunk.to_csv(writer, header=start == 0, index=False)
+    finally:
+        writer.close()
+    os.replace(tmp, path)
+    return path
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Gera uma base sintética no formato do CSV do Zomato')
+    parser.add_argument('path', help='arquivo de saída (.csv ou .parquet)')
+    parser.add_argument('--rows', type=int, required=True)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--chunk-rows', type=int, default=100_000)
+    parser.add_argument('--duplicate-rate', type=float, default=DUPLICATE_RATE)
+    parser.add_argument('--nan-rate', type=float, default=NAN_RATE)
+    args = parser.parse_args()
+
+    print(generate(args.path, args.rows, args.seed, args.chunk_rows, args.duplicate_rate, args.nan_rate))
@@ -0,0 +1,95 @@
+""" Tabelas paginadas no servidor
+
+    Busca, ordenação e projeção de colunas são feitas aqui; o navegador
+    recebe apenas as linhas e colunas da página visível.
+"""
+# Bibliotecas
+#============================================
+import math
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+TABLE_COLUMNS = ['restaurant_name', 'country', 'city', 'cuisines', 'aggregate_rating', 'votes']
+PAGE_SIZE = 20
+
+
+# 1. Busca, ordenação e página
+#============================================
+
+def search_rows(dataframe, query, columns):
+    """ Esta função procura o texto (sem diferenciar maiúsculas) nas colunas de texto
+
+        Colunas categóricas são buscadas nas categorias, não linha a linha.
+
+        Input: Dataframe, texto, colunas onde buscar
+        Output: posições das linhas encontradas (todas, se o texto for vazio)
+    """
+    if not query:
+        return np.arange(len(dataframe))
+
+    found = np.zeros(len(dataframe), dtype=bool)
+    for col in columns:
+        series = dataframe[col]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            hits = np.flatnonzero(series.cat.categories.str.contains(query, case=False, regex=False))
+            found |= np.isin(series.cat.codes.to_numpy(), hits)
+        elif series.dtype == object:
+            found |= series.str.contains(query, case=False, regex=False, na=False).to_numpy()
+    return np.flatnonzero(found)
+
+
+def sort_rows(dataframe, positions, by, ascending=True):
+    """ Esta função ordena (de forma estável) as posições pelo valor da coluna
+
+        Input: Dataframe, posições, coluna, ascending
+        Output: posições ordenadas
+    """
+    if by is None:
+        return positions
+    values = pd.Series(dataframe[by].to_numpy()[positions])
+    if isinstance(dataframe[by].dtype, pd.CategoricalDtype):
+        values = values.astype(str)
+    order = values.sort_values(ascending=ascending, kind='stable', na_position='last').index
+    return positions[order.to_numpy()]
+
+
+def page_rows(dataframe, positions, columns, page, page_size=PAGE_SIZE):
+    """ Esta função materializa apenas a página pedida (1 = primeira)
+
+        Input: Dataframe, posições ordenadas, colunas, página, tamanho da página
+        Output: Dataframe com as linhas e colunas da página
+    """
+    start = (page - 1) * page_size
+    rows = positions[start:start + page_size]
+    return dataframe.iloc[rows, dataframe.columns.get_indexer(columns)].reset_index(drop=True)
+
+
+# 2. Componente Streamlit
+#============================================
+
+def paginated_table(dataframe, key, columns=TABLE_COLUMNS, page_size=PAGE_SIZE):
+    """ Esta função mostra o dataframe paginado, com busca, ordenação e escolha de colunas
+
+        Input: Dataframe, chave única do componente na página, colunas
+               iniciais, linhas por página
+        Output: Dataframe da página mostrada
+    """
+    with st.expander('Opções da tabela'):
+        chosen = st.multiselect('Colunas', list(dataframe.columns), default=columns, key=f'{key}_columns')
+        chosen = chosen or list(columns)
+        query = st.text_input('Buscar', key=f'{key}_search').strip()
+        by = st.selectbox('Ordenar por', [None] + chosen, key=f'{key}_sort',
+                          format_func=lambda col: '(ordem original)' if col is None else col)
+        ascending = st.checkbox('Ordem crescente', value=True, key=f'{key}_ascending')
+
+    positions = search_rows(dataframe, query, chosen)
+    pages = max(1, math.ceil(len(positions) / page_size))
+    page = st.number_input('Página', min_value=1, max_value=pages, value=1, step=1, key=f'{key}_page')
+    page = min(int(page), pages)
+
+    table = page_rows(dataframe, sort_rows(dataframe, positions, by, ascending), chosen, page, page_size)
+    st.dataframe(table, hide_index=True)
+    st.caption(f'{len(positions)} restaurantes · página {page} de {pages}')
+    return table
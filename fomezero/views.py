@@ -0,0 +1,45 @@
+""" Seleções de linhas sobre a tabela compartilhada
+
+    O dataframe limpo é um só por processo (load_dataset) e nunca é
+    alterado. Cada sessão guarda apenas as posições das linhas do seu
+    filtro; as funções dos gráficos pedem somente as colunas que usam.
+"""
+# Bibliotecas
+#============================================
+import numpy as np
+
+
+# 1. Seleção
+#============================================
+
+class RowView:
+    """ Linhas selecionadas de uma tabela, guardadas apenas como posições.
+
+        Input: Dataframe compartilhado, posições das linhas (None = todas)
+    """
+
+    def __init__(self, table, positions=None):
+        self.table = table
+        if positions is None:
+            positions = np.arange(len(table))
+        self.positions = np.asarray(positions, dtype=np.intp)
+        self.positions.setflags(write=False)
+
+    def __len__(self):
+        return len(self.positions)
+
+    @property
+    def columns(self):
+        return self.table.columns
+
+    def select(self, columns):
+        """ Esta função materializa apenas as colunas pedidas das linhas selecionadas
+
+            Input: lista de colunas
+            Output: Dataframe (linhas selecionadas x colunas pedidas)
+        """
+        return self.table.iloc[self.positions, self.table.columns.get_indexer(columns)]
+
+    def column(self, name):
+        """ Uma coluna das linhas selecionadas, como Series. """
+        return self.table[name].iloc[self.positions]